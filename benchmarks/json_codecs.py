@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Compares the installed JSON codecs on synthetic ``/connectors?expand=info&expand=status`` payloads.
+Requires kafka_connect_api to be installed (or PYTHONPATH set to the repository root).
+
+    python benchmarks/json_codecs.py --connectors 5000 --tasks 4 --rounds 5
+"""
+
+import argparse
+from timeit import repeat
+
+from kafka_connect_api.json_codec import available_json_codecs
+
+
+def synthetic_cluster(connectors: int, tasks: int) -> dict:
+    """Generates the payload of a cluster with full configs and statuses for each connector"""
+    payload: dict = {}
+    for index in range(connectors):
+        name = f"connector-{index:05d}"
+        config = {
+            "connector.class": "io.confluent.connect.s3.S3SinkConnector",
+            "name": name,
+            "tasks.max": str(tasks),
+            "topics": ",".join(f"topic.{name}.{part}" for part in range(5)),
+            "s3.bucket.name": f"bucket-{index % 20}",
+            "flush.size": "10000",
+            "key.converter": "org.apache.kafka.connect.storage.StringConverter",
+            "value.converter": "io.confluent.connect.avro.AvroConverter",
+            "value.converter.schema.registry.url": "https://schema-registry:8081",
+        }
+        payload[name] = {
+            "info": {
+                "name": name,
+                "config": config,
+                "tasks": [{"connector": name, "task": task} for task in range(tasks)],
+                "type": "sink",
+            },
+            "status": {
+                "name": name,
+                "connector": {
+                    "state": "RUNNING",
+                    "worker_id": f"10.0.0.{index % 6}:8083",
+                },
+                "tasks": [
+                    {
+                        "id": task,
+                        "state": "RUNNING",
+                        "worker_id": f"10.0.0.{(index + task) % 6}:8083",
+                    }
+                    for task in range(tasks)
+                ],
+                "type": "sink",
+            },
+        }
+    return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connectors", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    codecs = available_json_codecs()
+    payload = synthetic_cluster(args.connectors, args.tasks)
+    body = codecs[-1].dumps(payload)
+    print(
+        f"{args.connectors} connectors, {args.tasks} tasks each - {len(body) / 1024 / 1024:.1f} MiB"
+    )
+    for codec in codecs:
+        loads = min(repeat(lambda: codec.loads(body), number=1, repeat=args.rounds))
+        dumps = min(repeat(lambda: codec.dumps(payload), number=1, repeat=args.rounds))
+        print(
+            f"{codec.name:>8} - loads {loads * 1000:8.1f} ms - dumps {dumps * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Records the requests made by an Api, to review or assert on how many requests an operation costs.
+
+.. code-block:: python
+
+    with api.record(max_requests=1) as audit:
+        cluster.set_logger_log_level("root", "DEBUG")
+    print(audit.summary())
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from os import path
+from threading import Lock
+from typing import NamedTuple, Union
+
+PACKAGE_DIR = path.dirname(path.abspath(__file__))
+IGNORED_CALLER_MODULES = ["concurrent.futures", "threading", "contextlib"]
+
+
+class RequestBudgetExceeded(AssertionError):
+    """
+    More requests than allowed were made
+    """
+
+
+class RecordedRequest(NamedTuple):
+    method: str
+    path: str
+    route: str
+    status_code: Union[int, None]
+    duration: float
+    caller: str
+
+    def __repr__(self):
+        return f"{self.method} {self.path} - {self.status_code} - {self.duration * 1000:.1f}ms - {self.caller}"
+
+
+def route_template(query_path: str) -> str:
+    """
+    Replaces the connector, task and logger names in the path with placeholders.
+
+    >>> route_template("/connectors/my-sink/tasks/0/status")
+    '/connectors/{connector}/tasks/{task}/status'
+    """
+    _path, _, query = query_path.partition("?")
+    parts = _path.strip("/").split("/")
+    if parts[0] == "connectors" and len(parts) > 1:
+        parts[1] = "{connector}"
+        if len(parts) > 3 and parts[2] == "tasks":
+            parts[3] = "{task}"
+    elif parts[:2] == ["admin", "loggers"] and len(parts) > 2:
+        parts[2] = "{logger}"
+    route = "/" + "/".join(parts)
+    return f"{route}?{query}" if query else route
+
+
+def find_caller() -> str:
+    """
+    :return: file:line (function) of the first frame outside of kafka_connect_api making the request
+    :rtype: str
+    """
+    frame = sys._getframe(1)
+    while frame:
+        file_name = path.abspath(frame.f_code.co_filename)
+        module = frame.f_globals.get("__name__", "")
+        if not file_name.startswith(PACKAGE_DIR) and not any(
+            module.startswith(ignored) for ignored in IGNORED_CALLER_MODULES
+        ):
+            return f"{file_name}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "unknown"
+
+
+class RequestAudit:
+    """
+    Context manager recording all the requests made by the Api while active, from any thread.
+    """
+
+    def __init__(self, api, max_requests: int = None):
+        """
+
+        :param Api api:
+        :param int max_requests: When set, raises RequestBudgetExceeded on exit if more requests were made.
+        """
+        self._api = api
+        self.max_requests = max_requests
+        self.requests: list = []
+        self._lock = Lock()
+
+    def __enter__(self) -> RequestAudit:
+        self._api.add_recorder(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._api.remove_recorder(self)
+        if exc_type is None and self.max_requests is not None:
+            self.assert_max_requests(self.max_requests)
+
+    def __len__(self):
+        return len(self.requests)
+
+    def add(self, recorded: RecordedRequest) -> None:
+        with self._lock:
+            self.requests.append(recorded)
+
+    def count(self, method: str = None, route: str = None) -> int:
+        """
+        :param str method: Only count requests with this method
+        :param str route: Only count requests with this route template
+        :rtype: int
+        """
+        return len(
+            [
+                recorded
+                for recorded in self.requests
+                if (method is None or recorded.method == method)
+                and (route is None or recorded.route == route)
+            ]
+        )
+
+    def summary(self) -> dict:
+        """
+        :return: number of requests by "METHOD route"
+        :rtype: dict
+        """
+        return dict(
+            Counter(f"{recorded.method} {recorded.route}" for recorded in self.requests)
+        )
+
+    @property
+    def duration(self) -> float:
+        """Sum of the requests durations, in seconds"""
+        return sum(recorded.duration for recorded in self.requests)
+
+    def assert_max_requests(
+        self, max_requests: int, method: str = None, route: str = None
+    ) -> None:
+        """
+        :raises RequestBudgetExceeded: if more than max_requests (matching method/route if set) were made
+        """
+        count = self.count(method, route)
+        if count > max_requests:
+            raise RequestBudgetExceeded(
+                f"{count} requests made, at most {max_requests} expected",
+                self.requests,
+            )
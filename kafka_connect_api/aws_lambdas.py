@@ -6,14 +6,22 @@
 Module with functions that can be used as AWS Lambda Handlers to perform various tasks
 """
 
+import json
 import logging
+from functools import wraps
 from os import environ
 from time import sleep
 
 from jsonschema import validate
 
+from .deadline import Deadline
+from .errors import DeadlineExceeded
 from .kafka_connect_api import Api, Cluster, Connector
-from .tools import KEYISSET
+from .rolling_restart import RollingRestart
+from .supervisor import Supervisor
+from .tools import KEYISSET, run_concurrently
+
+BATCH_MAX_WORKERS = int(environ.get("CONNECT_BATCH_MAX_WORKERS", 8))
 
 CLUSTER_CONFIG_SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -53,6 +61,21 @@ CONNECTOR_CONFIG_SCHEMA = {
 }
 
 
+def with_lambda_deadline(handler):
+    """
+    Decorator running the handler with an operation deadline set from the Lambda remaining time,
+    minus CONNECT_DEADLINE_MARGIN_SECONDS, so that requests time out and partial results are returned
+    before the function is stopped.
+    """
+
+    @wraps(handler)
+    def wrapped_handler(event, context):
+        with Deadline.from_lambda_context(context):
+            return handler(event, context)
+
+    return wrapped_handler
+
+
 def setup_logging():
     """
     In case this is used in a Lambda function, removes the AWS Lambda default log handler
@@ -144,17 +167,108 @@ def get_connector(event):
     api = Api(**cluster_config)
     cluster = Cluster(api)
     log.info(cluster)
-    if name not in cluster.connectors:
+    connectors = cluster.connectors
+    if name not in connectors:
         raise KeyError(f"Connector {name} is not present in cluster {cluster}")
-    return cluster.connectors[name]
+    return connectors[name]
+
+
+def get_batch_items(event) -> list:
+    """
+    Function to list the connectors to process from a batch event. Supports
+
+    * a list of connectors configurations in ``connectors``
+    * SQS records, each body being the JSON of a connector configuration, or of ``{"connector": {}}``
+    * EventBridge events, with ``connector`` or ``connectors`` in the event ``detail``
 
+    :param dict event:
+    :return: list of (item_identifier, connector_config). connector_config is the exception if the item is invalid
+    :rtype: list[tuple]
+    """
+    items: list = []
+    if KEYISSET("Records", event):
+        for record in event["Records"]:
+            identifier = record.get("messageId")
+            try:
+                body = json.loads(record["body"])
+                items.append((identifier, body.get("connector", body)))
+            except (KeyError, ValueError, AttributeError) as error:
+                items.append((identifier, error))
+        return items
+    source = event["detail"] if KEYISSET("detail", event) else event
+    if KEYISSET("connectors", source):
+        connectors = source["connectors"]
+    elif KEYISSET("connector", source):
+        connectors = [source["connector"]]
+    else:
+        raise KeyError("No connectors given in event to process")
+    for connector_config in connectors:
+        identifier = (
+            connector_config.get("name")
+            if isinstance(connector_config, dict)
+            else connector_config
+        )
+        items.append((identifier, connector_config))
+    return items
+
+
+def process_connectors_batch(event, action, max_workers: int = None) -> dict:
+    """
+    Function to run action against several connectors of the same connect cluster.
+    The cluster is resolved and its connectors listed once, the connectors are processed concurrently.
+    Returns the result for each item, with ``batchItemFailures`` to report SQS partial batch failures.
 
+    :param dict event:
+    :param action: callable taking the Connector as argument
+    :param int max_workers: Maximum number of connectors to process at once
+    :return: the batch results
+    :rtype: dict
+    """
+    log = setup_logging()
+    items = get_batch_items(event)
+    cluster_config = set_cluster_config(
+        event["detail"] if KEYISSET("detail", event) else event
+    )
+    api = Api(**cluster_config)
+    cluster = Cluster(api)
+    connectors = cluster.connectors
+
+    def _process(item):
+        connector_config = item[1]
+        if isinstance(connector_config, Exception):
+            raise connector_config
+        validate(connector_config, CONNECTOR_CONFIG_SCHEMA)
+        name = connector_config["name"]
+        if name not in connectors:
+            raise KeyError(f"Connector {name} is not present in cluster {api.url}")
+        return action(connectors[name])
+
+    results: list = []
+    failures: list = []
+    for item, result, error in run_concurrently(
+        _process, items, max_workers or BATCH_MAX_WORKERS
+    ):
+        if error:
+            log.error(f"{item[0]} - {error}")
+            results.append(
+                {"itemIdentifier": item[0], "status": "failed", "error": str(error)}
+            )
+            failures.append({"itemIdentifier": item[0]})
+        else:
+            results.append(
+                {"itemIdentifier": item[0], "status": "success", "result": result}
+            )
+    return {"results": results, "batchItemFailures": failures}
+
+
+@with_lambda_deadline
 def restart_all_connectors(event, context):
     """
     Function to restart all the connectors in a Connect cluster
 
     :param dict event:
     :param dict context:
+    :return: 0, or the connectors that could not be restarted before the deadline
     """
     log = setup_logging()
     cluster_config = set_cluster_config(event)
@@ -162,12 +276,44 @@ def restart_all_connectors(event, context):
     cluster = Cluster(api)
     log.info(f"Restarting all connectors in {cluster}")
     log.info(cluster)
-    for connector in cluster.connectors.values():
+    connectors = list(cluster.connectors.values())
+    for index, connector in enumerate(connectors):
         log.info(f"Restarting {connector}")
-        connector.cycle_connector()
+        try:
+            connector.cycle_connector()
+        except DeadlineExceeded:
+            not_restarted = [_connector.name for _connector in connectors[index:]]
+            log.error(f"Deadline passed. Connectors not restarted: {not_restarted}")
+            return {"not_restarted": not_restarted}
     return 0
 
 
+@with_lambda_deadline
+def rolling_restart_connectors(event, context):
+    """
+    Function to restart the connectors of a Connect cluster in waves, FAILED ones first.
+    Settings are read from ``rolling_restart`` in the event, with the same keys as RollingRestart.
+
+    :param dict event:
+    :param dict context:
+    :return: the rolling restart report
+    :rtype: dict
+    """
+    log = setup_logging()
+    cluster_config = set_cluster_config(event)
+    api = Api(**cluster_config)
+    cluster = Cluster(api)
+    settings = event.get("rolling_restart", {}) if isinstance(event, dict) else {}
+    log.info(f"Rolling restart of connectors in {api.url} - {settings}")
+    report = RollingRestart(cluster, **settings).run()
+    report["restarted"] = [str(item) for item in report["restarted"]]
+    report["failed"] = [str(item) for item in report["failed"]]
+    report["skipped"] = [str(item) for item in report["skipped"]]
+    report["unverified"] = [str(item) for item in report["unverified"]]
+    return report
+
+
+@with_lambda_deadline
 def create_update_connector(event, context):
     """
     Function to create / update a new connector
@@ -199,6 +345,7 @@ def create_update_connector(event, context):
     return 0
 
 
+@with_lambda_deadline
 def delete_connector(event, context):
     """
     Function to delete a connector. No need for config
@@ -213,6 +360,7 @@ def delete_connector(event, context):
     return 0
 
 
+@with_lambda_deadline
 def restart_connector(event, context):
     """
     Function to delete a connector. No need for config
@@ -229,6 +377,7 @@ def restart_connector(event, context):
     return 0
 
 
+@with_lambda_deadline
 def check_connector_health(event, context):
     """
     Function to evaluate the connector health
@@ -237,13 +386,128 @@ def check_connector_health(event, context):
     :param dict context:
     :return:
     """
+    connector = get_connector(event)
+    return connector_is_healthy(connector)
+
+
+def connector_is_healthy(connector: Connector) -> bool:
+    """
+    Evaluates whether all the tasks of the connector are RUNNING, from one status query
+
+    :param Connector connector:
+    :rtype: bool
+    """
     log = setup_logging()
     tasks_health = []
-    connector = get_connector(event)
-    for task in connector.tasks:
-        log.info(f"Task {task.id} for connector {connector} state is {task.state}")
-        tasks_health.append(task.is_running())
+    for task in connector.status["tasks"]:
+        log.info(
+            f"Task {task['id']} for connector {connector} state is {task['state']}"
+        )
+        tasks_health.append(task["state"] == "RUNNING")
     if all(tasks_health):
         log.info(f"All tasks for connector {connector} are RUNNING")
         return True
     return False
+
+
+@with_lambda_deadline
+def delete_connectors(event, context):
+    """
+    Function to delete several connectors at once. No need for config
+
+    :param dict event:
+    :param dict context:
+    :return: the batch results
+    :rtype: dict
+    """
+    return process_connectors_batch(event, lambda connector: connector.delete())
+
+
+@with_lambda_deadline
+def restart_connectors(event, context):
+    """
+    Function to cycle several connectors through pause / restart all tasks / resume at once
+
+    :param dict event:
+    :param dict context:
+    :return: the batch results
+    :rtype: dict
+    """
+    return process_connectors_batch(
+        event, lambda connector: connector.cycle_connector()
+    )
+
+
+@with_lambda_deadline
+def check_connectors_health(event, context):
+    """
+    Function to evaluate the health of several connectors at once
+
+    :param dict event:
+    :param dict context:
+    :return: the batch results, with the health of each connector as result
+    :rtype: dict
+    """
+    return process_connectors_batch(event, connector_is_healthy)
+
+
+@with_lambda_deadline
+def check_cluster_health(event, context):
+    """
+    Function to evaluate the health of all the connectors of the cluster. The connectors statuses are streamed
+    and evaluated one at a time, to keep memory usage low on large clusters.
+
+    :param dict event:
+    :param dict context:
+    :return: the number of healthy connectors, the states of the unhealthy ones, and whether all the
+      connectors were evaluated before the deadline
+    :rtype: dict
+    """
+    log = setup_logging()
+    cluster_config = set_cluster_config(event)
+    cluster = Cluster(Api(**cluster_config))
+    healthy: int = 0
+    unhealthy: dict = {}
+    try:
+        for name, details in cluster.iter_connectors(("status",)):
+            status = details["status"]
+            states = [status["connector"]["state"]] + [
+                task["state"] for task in status["tasks"]
+            ]
+            if all(state == "RUNNING" for state in states):
+                healthy += 1
+            else:
+                log.warning(f"{name} is not healthy: {states}")
+                unhealthy[name] = states
+    except DeadlineExceeded:
+        log.error(
+            f"Deadline passed. Evaluated {healthy + len(unhealthy)} connectors only"
+        )
+        return {"healthy": healthy, "unhealthy": unhealthy, "complete": False}
+    return {"healthy": healthy, "unhealthy": unhealthy, "complete": True}
+
+
+@with_lambda_deadline
+def supervise_connectors(event, context):
+    """
+    Function to restart the FAILED tasks of the cluster, to run on a schedule.
+    Settings are read from ``supervisor`` in the event, with the same keys as Supervisor.
+    The tasks restart history is kept in /tmp between invocations of the same Lambda container.
+
+    :param dict event:
+    :param dict context:
+    :return: the events of this run, and the quarantined tasks
+    :rtype: dict
+    """
+    setup_logging()
+    cluster_config = set_cluster_config(event)
+    cluster = Cluster(Api(**cluster_config))
+    settings = event.get("supervisor", {}) if isinstance(event, dict) else {}
+    supervisor = Supervisor(cluster, **settings)
+    supervisor.load_state_file()
+    events = supervisor.poll_once()
+    supervisor.save_state()
+    return {
+        "events": events,
+        "quarantined": [f"{key[0]}.{key[1]}" for key in supervisor.quarantined],
+    }
@@ -0,0 +1,264 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Batches of write operations, run concurrently unless an operation depends on another.
+
+.. code-block:: python
+
+    batch = api.batch()
+    deleted = batch.delete_connector("connector-a")
+    batch.set_config("connector-b", config, depends_on=[deleted])
+    batch.resume("connector-c")
+    result = batch.execute(rollback=True)
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Response
+
+    from .kafka_connect_api import Api
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+
+from .errors import GenericNotFound
+from .tools import DEFAULT_MAX_WORKERS
+
+PENDING = "pending"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+ROLLED_BACK = "rolled_back"
+
+
+class BatchOperation:
+    """
+    One write request of a batch. rollback is set to (method, path, payload) once the operation
+    captured the state to restore.
+    """
+
+    def __init__(
+        self,
+        op_id: str,
+        method: str,
+        path: str,
+        payload=None,
+        depends_on: list = None,
+        connector_config: str = None,
+    ):
+        self.id = op_id
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.depends_on = depends_on or []
+        self.connector_config = connector_config
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.rollback = None
+        self.rollback_error = None
+
+    def __repr__(self):
+        return f"{self.id} - {self.method} {self.path} - {self.status}"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "result": self.result,
+            "error": str(self.error) if self.error else None,
+            "rollback_error": str(self.rollback_error) if self.rollback_error else None,
+        }
+
+
+class WriteBatch:
+    """
+    Collects write operations, with optional dependencies between them, and executes them.
+    An operation can only depend on operations added before it, and is skipped if one of them did not succeed.
+    """
+
+    def __init__(self, api: Api, max_workers: int = None):
+        self._api = api
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.operations: dict = {}
+
+    def __len__(self):
+        return len(self.operations)
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        json=None,
+        depends_on: list = None,
+        name: str = None,
+        connector_config: str = None,
+    ) -> str:
+        """
+        Adds an operation to the batch.
+
+        :param str method: PUT, POST or DELETE
+        :param str path: The query path
+        :param json: The payload of the request
+        :param list depends_on: IDs of the operations that must succeed before this one runs
+        :param str name: ID of the operation. Defaults to ``op-<index>``, skipping the IDs already used
+        :param str connector_config: Connector the operation sets the configuration of, to roll it back
+        :return: the operation ID
+        :rtype: str
+        """
+        method = method.upper()
+        if method not in ["PUT", "POST", "DELETE"]:
+            raise ValueError("method must be one of", ["PUT", "POST", "DELETE"])
+        op_id = name or self._default_id()
+        if op_id in self.operations:
+            raise ValueError(op_id, "is already defined in the batch")
+        for dependency in depends_on or []:
+            if dependency not in self.operations:
+                raise KeyError(
+                    dependency,
+                    "must be added to the batch before the operations depending on it",
+                )
+        self.operations[op_id] = BatchOperation(
+            op_id, method, path, json, list(depends_on or []), connector_config
+        )
+        return op_id
+
+    def _default_id(self) -> str:
+        index = len(self.operations)
+        while f"op-{index}" in self.operations:
+            index += 1
+        return f"op-{index}"
+
+    def put(self, path: str, json=None, depends_on: list = None, name: str = None):
+        return self.add("PUT", path, json, depends_on, name)
+
+    def post(self, path: str, json=None, depends_on: list = None, name: str = None):
+        return self.add("POST", path, json, depends_on, name)
+
+    def delete(self, path: str, depends_on: list = None, name: str = None):
+        return self.add("DELETE", path, None, depends_on, name)
+
+    def set_config(
+        self, connector: str, config: dict, depends_on: list = None, name: str = None
+    ) -> str:
+        """Creates or updates the connector configuration. Can be rolled back."""
+        if not isinstance(config, dict):
+            raise TypeError(
+                connector,
+                "connect configuration must be a dictionary/mapping. Got",
+                type(config),
+            )
+        return self.add(
+            "PUT",
+            f"/connectors/{connector}/config",
+            config,
+            depends_on,
+            name,
+            connector_config=connector,
+        )
+
+    def delete_connector(
+        self, connector: str, depends_on: list = None, name: str = None
+    ) -> str:
+        return self.delete(f"/connectors/{connector}", depends_on, name)
+
+    def pause(self, connector: str, depends_on: list = None, name: str = None) -> str:
+        return self.put(f"/connectors/{connector}/pause", None, depends_on, name)
+
+    def resume(self, connector: str, depends_on: list = None, name: str = None) -> str:
+        return self.put(f"/connectors/{connector}/resume", None, depends_on, name)
+
+    def _response(self, req: Response):
+        if not req.content:
+            return req.status_code
+        try:
+            return self._api.decode(req)
+        except ValueError:
+            return req.text
+
+    def _run(self, operation: BatchOperation):
+        if operation.connector_config:
+            try:
+                previous = self._api.get(
+                    f"/connectors/{operation.connector_config}/config"
+                )
+                operation.rollback = ("PUT", operation.path, previous)
+            except GenericNotFound:
+                operation.rollback = (
+                    "DELETE",
+                    f"/connectors/{operation.connector_config}",
+                    None,
+                )
+        return self._send(operation.method, operation.path, operation.payload)
+
+    def _send(self, method: str, path: str, payload=None):
+        kwargs = {} if payload is None else {"json": payload}
+        if method == "PUT":
+            return self._response(self._api.put_raw(path, **kwargs))
+        if method == "POST":
+            return self._response(self._api.post_raw(path, **kwargs))
+        return self._response(self._api.delete_raw(path, **kwargs))
+
+    def execute(self, rollback: bool = False) -> dict:
+        """
+        Runs the operations, concurrently when they do not depend on each other.
+
+        :param bool rollback: If an operation fails, restore the connectors configurations set by the
+          operations that succeeded, in reverse order. Other operations are not rolled back.
+        :return: whether all operations succeeded, the result of each operation, and the operations rolled back.
+        :rtype: dict
+        """
+        pending = [op for op in self.operations.values() if op.status == PENDING]
+        running: dict = {}
+        completed: list = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for operation in list(pending):
+                    states = [
+                        self.operations[dependency].status
+                        for dependency in operation.depends_on
+                    ]
+                    if any(state in [FAILED, SKIPPED] for state in states):
+                        operation.status = SKIPPED
+                        pending.remove(operation)
+                    elif all(state == SUCCEEDED for state in states):
+                        future = executor.submit(
+                            copy_context().run, self._run, operation
+                        )
+                        running[future] = operation
+                        pending.remove(operation)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    operation = running.pop(future)
+                    try:
+                        operation.result = future.result()
+                        operation.status = SUCCEEDED
+                        completed.append(operation)
+                    except Exception as error:
+                        operation.error = error
+                        operation.status = FAILED
+        succeeded = all(op.status == SUCCEEDED for op in self.operations.values())
+        rolled_back: list = []
+        if rollback and not succeeded:
+            for operation in reversed(completed):
+                if not operation.rollback:
+                    continue
+                try:
+                    self._send(*operation.rollback)
+                    operation.status = ROLLED_BACK
+                    rolled_back.append(operation.id)
+                except Exception as error:
+                    operation.rollback_error = error
+        return {
+            "succeeded": succeeded,
+            "operations": [op.to_dict() for op in self.operations.values()],
+            "rolled_back": rolled_back,
+        }
@@ -0,0 +1,94 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Command line entrypoint.
+
+    kafka-connect-api --url http://connect:8083 supervise --interval 30
+"""
+
+import argparse
+import json
+import logging
+import sys
+from os import environ
+
+from .kafka_connect_api import Api, Cluster
+from .supervisor import Supervisor
+
+
+def main_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        "kafka-connect-api", description="Apache Kafka Connect operations"
+    )
+    parser.add_argument(
+        "--url",
+        default=environ.get("CONNECT_CLUSTER_URL"),
+        help="Connect cluster URL. Defaults to CONNECT_CLUSTER_URL",
+    )
+    parser.add_argument(
+        "--hostname",
+        default=environ.get("CONNECT_CLUSTER_HOSTNAME"),
+        help="Connect cluster hostname, if url is not set. Defaults to CONNECT_CLUSTER_HOSTNAME",
+    )
+    parser.add_argument(
+        "--port", type=int, default=int(environ.get("CONNECT_CLUSTER_PORT", 8083))
+    )
+    parser.add_argument(
+        "--username", default=environ.get("CONNECT_CLUSTER_BASIC_AUTH_USERNAME")
+    )
+    parser.add_argument(
+        "--password", default=environ.get("CONNECT_CLUSTER_BASIC_AUTH_PASSWORD")
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    supervise = subparsers.add_parser(
+        "supervise", help="Restart FAILED tasks, with backoff and quarantine"
+    )
+    supervise.add_argument("--interval", type=float, default=30.0)
+    supervise.add_argument("--iterations", type=int, default=None)
+    supervise.add_argument("--base-backoff", type=float, default=10.0)
+    supervise.add_argument("--max-backoff", type=float, default=600.0)
+    supervise.add_argument("--max-restarts", type=int, default=5)
+    supervise.add_argument("--restart-window", type=float, default=3600.0)
+    supervise.add_argument(
+        "--connector",
+        dest="connectors",
+        action="append",
+        help="Connector to supervise. Repeat for several. Defaults to all",
+    )
+    return parser
+
+
+def main(args=None) -> int:
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)8s] %(message)s")
+    options = main_parser().parse_args(args)
+    if not options.url and not options.hostname:
+        print("--url or --hostname must be set", file=sys.stderr)
+        return 1
+    api = Api(
+        hostname=options.hostname,
+        port=options.port,
+        url=options.url,
+        username=options.username,
+        password=options.password,
+    )
+    cluster = Cluster(api)
+    if options.command == "supervise":
+        supervisor = Supervisor(
+            cluster,
+            base_backoff=options.base_backoff,
+            max_backoff=options.max_backoff,
+            max_restarts=options.max_restarts,
+            restart_window=options.restart_window,
+            on_event=lambda event: print(json.dumps(event), flush=True),
+            connectors=options.connectors,
+        )
+        try:
+            supervisor.run(interval=options.interval, iterations=options.iterations)
+        except KeyboardInterrupt:
+            supervisor.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
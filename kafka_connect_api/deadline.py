@@ -0,0 +1,95 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Deadlines shared by all the requests of an operation.
+
+.. code-block:: python
+
+    with Deadline(30):
+        connector.cycle_connector()
+
+The requests made by the Api within the block use at most the remaining time as timeout, and raise
+DeadlineExceeded once it passed. The deadline follows the operations run with tools.run_concurrently.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from os import environ
+from time import monotonic
+from typing import Union
+
+from .errors import DeadlineExceeded
+
+LAMBDA_DEADLINE_MARGIN = float(environ.get("CONNECT_DEADLINE_MARGIN_SECONDS", 3.0))
+
+_CURRENT_DEADLINE: ContextVar = ContextVar("kafka_connect_api_deadline", default=None)
+
+
+def current_deadline() -> Union[Deadline, None]:
+    """
+    :return: The deadline of the operation in progress, if any
+    """
+    return _CURRENT_DEADLINE.get()
+
+
+class Deadline:
+    """
+    Point in time the operation must be completed by. Nested deadlines cannot extend the outer one.
+    """
+
+    def __init__(self, seconds: Union[float, None]):
+        """
+
+        :param float seconds: Time allowed from now. None for no deadline.
+        """
+        self.expires_at = None if seconds is None else monotonic() + seconds
+        self._tokens: list = []
+
+    def __repr__(self):
+        remaining = self.remaining()
+        return f"Deadline({'none' if remaining is None else f'{remaining:.3f}s'})"
+
+    @classmethod
+    def from_lambda_context(
+        cls, context, margin: float = LAMBDA_DEADLINE_MARGIN
+    ) -> Deadline:
+        """
+        Deadline ending margin seconds before the AWS Lambda function times out.
+
+        :param context: The Lambda context
+        :param float margin: Seconds kept to return a result before the function is stopped
+        :rtype: Deadline
+        """
+        if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+            return cls(None)
+        return cls(max(context.get_remaining_time_in_millis() / 1000 - margin, 0))
+
+    def remaining(self) -> Union[float, None]:
+        """Seconds left before the deadline, None when there is no deadline"""
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """
+        :raises DeadlineExceeded: if the deadline passed
+        """
+        if self.expired:
+            raise DeadlineExceeded("The operation deadline passed")
+
+    def __enter__(self) -> Deadline:
+        outer = current_deadline()
+        if outer and outer.expires_at is not None:
+            if self.expires_at is None or outer.expires_at < self.expires_at:
+                self.expires_at = outer.expires_at
+        self._tokens.append(_CURRENT_DEADLINE.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _CURRENT_DEADLINE.reset(self._tokens.pop())
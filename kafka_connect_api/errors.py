@@ -116,3 +116,9 @@ def evaluate_api_return(function):
             raise
 
     return wrapped_answer
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    The deadline of the operation passed before the request could be made
+    """
@@ -0,0 +1,210 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Groups the FAILED connectors and tasks of a cluster by the exception in their trace, so that an incident
+affecting many connectors can be reviewed and acted upon as one.
+
+.. code-block:: python
+
+    report = cluster.failures()
+    for group in report.groups:
+        print(group.count, group.signature, group.connectors)
+    report.groups[0].restart()
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .kafka_connect_api import Cluster
+
+import re
+
+from .tools import run_concurrently
+
+NORMALIZERS = [
+    (
+        re.compile(
+            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I
+        ),
+        "<uuid>",
+    ),
+    (re.compile(r"0x[0-9a-f]+", re.I), "<hex>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\d+"), "<n>"),
+]
+
+EXCEPTION_CLASS = re.compile(r"^[\w$.]+$")
+
+
+def normalize_message(message: str) -> str:
+    """Replaces the values specific to one occurrence (ids, quoted values, numbers) with placeholders"""
+    for pattern, placeholder in NORMALIZERS:
+        message = pattern.sub(placeholder, message)
+    return message.strip()
+
+
+def split_exception_line(line: str) -> tuple:
+    """
+    Splits a ``ExceptionClass: message`` line, and normalizes the message.
+    The exception is None if the line does not start with an exception class, and the whole line is normalized.
+
+    :return: the exception class, and the normalized line
+    :rtype: tuple
+    """
+    exception, separator, message = line.partition(":")
+    exception = exception.strip()
+    if not EXCEPTION_CLASS.match(exception):
+        return None, normalize_message(line)
+    if not separator:
+        return exception, exception
+    return exception, f"{exception}: {normalize_message(message)}"
+
+
+def parse_trace(trace: str) -> tuple:
+    """
+    Signature of a Java stack trace: the normalized first exception line, and the normalized root cause.
+
+    :param str trace: The trace of the FAILED connector/task status
+    :return: the signature, and the exception class of the first line of the trace
+    :rtype: tuple
+    """
+    lines = [line.strip() for line in trace.strip().splitlines() if line.strip()]
+    if not lines:
+        return "", None
+    exception, signature = split_exception_line(lines[0])
+    causes = [line for line in lines[1:] if line.startswith("Caused by:")]
+    if causes:
+        _, cause = split_exception_line(causes[-1][len("Caused by:") :])
+        signature = f"{signature} <- {cause}"
+    return signature, exception
+
+
+def exception_signature(trace: str) -> str:
+    """
+    :param str trace: The trace of the FAILED connector/task status
+    :return: the signature of the trace, as returned by parse_trace
+    :rtype: str
+    """
+    return parse_trace(trace)[0]
+
+
+class FailureGroup:
+    """
+    Connectors and tasks that failed with the same exception signature, and the exception class of the first
+    line of their trace. Tasks are (connector name, task id). Failed connectors are (connector name, None).
+    """
+
+    def __init__(
+        self,
+        cluster: Cluster,
+        signature: str,
+        sample_trace: str,
+        exception: str = None,
+    ):
+        self._cluster = cluster
+        self.signature = signature
+        self.exception = exception
+        self.sample_trace = sample_trace
+        self.failures: list = []
+
+    def __repr__(self):
+        return f"{self.count} - {self.signature}"
+
+    @property
+    def count(self) -> int:
+        return len(self.failures)
+
+    @property
+    def connectors(self) -> list:
+        return sorted({name for name, _ in self.failures})
+
+    def _apply(self, action, items: list, max_workers: int = None) -> dict:
+        results: dict = {"succeeded": [], "failed": {}}
+        for item, _, error in run_concurrently(action, items, max_workers):
+            if error:
+                results["failed"][str(item)] = str(error)
+            else:
+                results["succeeded"].append(item)
+        return results
+
+    def restart(self, max_workers: int = None) -> dict:
+        """Restarts the failed tasks, and the failed connectors, of the group"""
+
+        def _restart(item):
+            name, task_id = item
+            if task_id is None:
+                return self._cluster.api.post_raw(f"/connectors/{name}/restart")
+            return self._cluster.api.post_raw(
+                f"/connectors/{name}/tasks/{task_id}/restart"
+            )
+
+        return self._apply(_restart, self.failures, max_workers)
+
+    def pause(self, max_workers: int = None) -> dict:
+        """Pauses the connectors of the group"""
+        return self._apply(
+            lambda name: self._cluster.api.put_raw(f"/connectors/{name}/pause"),
+            self.connectors,
+            max_workers,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "signature": self.signature,
+            "exception": self.exception,
+            "count": self.count,
+            "connectors": self.connectors,
+            "failures": [
+                name if task_id is None else f"{name}.{task_id}"
+                for name, task_id in self.failures
+            ],
+            "sample_trace": self.sample_trace,
+        }
+
+
+class FailureReport:
+    """
+    FAILED connectors and tasks of the cluster, grouped by exception signature, from the connectors statuses.
+    """
+
+    def __init__(self, cluster: Cluster, statuses: dict):
+        """
+
+        :param Cluster cluster:
+        :param dict statuses: The connectors statuses, by connector name, as returned by Cluster.statuses
+        """
+        self._cluster = cluster
+        _groups: dict = {}
+        for name, status in statuses.items():
+            failures = []
+            if status["connector"]["state"] == "FAILED":
+                failures.append(((name, None), status["connector"].get("trace", "")))
+            for task in status["tasks"]:
+                if task["state"] == "FAILED":
+                    failures.append(((name, task["id"]), task.get("trace", "")))
+            for item, trace in failures:
+                signature, exception = parse_trace(trace or "")
+                if signature not in _groups:
+                    _groups[signature] = FailureGroup(
+                        cluster, signature, trace, exception
+                    )
+                _groups[signature].failures.append(item)
+        self.groups: list = sorted(
+            _groups.values(), key=lambda group: group.count, reverse=True
+        )
+
+    def __repr__(self):
+        return f"{self.count} failures in {len(self.groups)} groups"
+
+    @property
+    def count(self) -> int:
+        return sum(group.count for group in self.groups)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "groups": [group.to_dict() for group in self.groups],
+        }
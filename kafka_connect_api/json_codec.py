@@ -0,0 +1,78 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+JSON codecs used to encode the requests payloads and decode the API responses.
+orjson or ujson are used when installed, with a fallback to the standard library json.
+"""
+
+from __future__ import annotations
+
+import json
+from importlib import import_module
+from typing import Callable, Union
+
+CODECS_PRIORITY = ["orjson", "ujson", "json"]
+
+
+class JsonCodec:
+    """
+    JSON encoder/decoder. loads must accept bytes, and raise a ValueError for invalid JSON.
+    dumps returns bytes, UTF-8 encoded.
+    """
+
+    def __init__(self, name: str, loads: Callable, dumps: Callable):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return self.name
+
+
+def _import_codec(name: str) -> JsonCodec:
+    if name == "json":
+        return JsonCodec(
+            "json",
+            json.loads,
+            lambda obj: json.dumps(obj, separators=(",", ":")).encode(),
+        )
+    module = import_module(name)
+    if name == "orjson":
+        return JsonCodec(name, module.loads, module.dumps)
+    return JsonCodec(name, module.loads, lambda obj: module.dumps(obj).encode())
+
+
+def get_json_codec(codec: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    """
+    Returns the JSON codec to use.
+
+    :param codec: Name of the codec (orjson, ujson, json) or a JsonCodec. Defaults to the fastest installed.
+    :rtype: JsonCodec
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is not None:
+        if codec not in CODECS_PRIORITY:
+            raise ValueError("codec must be one of", CODECS_PRIORITY, "got", codec)
+        return _import_codec(codec)
+    for name in CODECS_PRIORITY:
+        try:
+            return _import_codec(name)
+        except ImportError:
+            continue
+    return _import_codec("json")
+
+
+def available_json_codecs() -> list:
+    """
+    :return: the JSON codecs that can be imported
+    :rtype: list[JsonCodec]
+    """
+    codecs: list = []
+    for name in CODECS_PRIORITY:
+        try:
+            codecs.append(_import_codec(name))
+        except ImportError:
+            continue
+    return codecs
@@ -5,19 +5,37 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Generator, Union
 
 if TYPE_CHECKING:
     from requests import Response
 
+import logging
 import re
+from copy import deepcopy
+from threading import Event, Lock
+from time import monotonic
 
-from requests import delete, get, post, put
+from requests import request
 from requests.auth import HTTPBasicAuth
-
-from .errors import evaluate_api_return
+from requests.exceptions import RequestException, Timeout
+
+from .audit import RecordedRequest, RequestAudit, find_caller, route_template
+from .batch import WriteBatch
+from .deadline import current_deadline
+from .errors import DeadlineExceeded, evaluate_api_return
+from .failures import FailureReport
+from .json_codec import JsonCodec, get_json_codec
+from .loggers import TemporaryLogLevels
+from .placement import PlacementReport
+from .streaming import iter_json_items
+from .tools import run_concurrently
 
 LOG_LEVELS = ["INFO", "DEBUG", "TRACE", "WARN", "ERROR", "CRITICAL"]
+LOGGERS_CACHE_TTL = 60.0
+CLEANUP_TIMEOUT = 2.0
+
+LOG = logging.getLogger(__name__)
 
 
 class Task:
@@ -55,6 +73,16 @@ class Task:
     def state(self):
         return self.status["state"]
 
+    @property
+    def worker_id(self) -> str:
+        """The worker the task runs on"""
+        return self.status["worker_id"]
+
+    @property
+    def trace(self) -> Union[str, None]:
+        """The stack trace of the task failure, if FAILED"""
+        return self.status.get("trace")
+
     def is_running(self):
         if self.state == "RUNNING":
             return True
@@ -116,9 +144,16 @@ class Connector:
         self.api.delete_raw(f"/connectors/{self.name}")
 
     def cycle_connector(self) -> None:
-        self.pause()
-        self.restart_all_tasks()
-        self.resume()
+        """
+        Pauses the connector, restarts all its tasks, and resumes it.
+        The connector is resumed even if pausing it or restarting the tasks failed, or the operation deadline
+        passed, with a timeout of CLEANUP_TIMEOUT seconds.
+        """
+        try:
+            self.pause()
+            self.restart_all_tasks()
+        finally:
+            self.api.put_raw(f"/connectors/{self.name}/resume", timeout=CLEANUP_TIMEOUT)
 
     @property
     def status(self) -> dict:
@@ -128,6 +163,27 @@ class Connector:
     def state(self):
         return self.status["connector"]["state"]
 
+    @property
+    def worker_id(self) -> str:
+        """The worker the connector runs on"""
+        return self.status["connector"]["worker_id"]
+
+    @property
+    def failures(self) -> dict:
+        """
+        The traces of the connector and tasks that are FAILED, from one status request
+
+        :return: the trace by task id, and ``connector`` for the connector itself
+        """
+        _status = self.status
+        _failures: dict = {}
+        if _status["connector"]["state"] == "FAILED":
+            _failures["connector"] = _status["connector"].get("trace")
+        for _task in _status["tasks"]:
+            if _task["state"] == "FAILED":
+                _failures[_task["id"]] = _task.get("trace")
+        return _failures
+
     @property
     def config(self):
         _config = self.api.get(f"/connectors/{self.name}")
@@ -171,6 +227,10 @@ class Cluster:
 
     def __init__(self, api: Api):
         self._api = api
+        self._loggers: Union[dict, None] = None
+        self._loggers_retrieved_at: float = 0.0
+        self._loggers_lock = Lock()
+        self._cluster_scope_loggers: Union[bool, None] = None
 
     def get(self):
         return self._api.get("/")
@@ -195,13 +255,80 @@ class Cluster:
             _cluster_connectors[connector] = Connector(self, connector)
         return _cluster_connectors
 
+    def query(self):
+        """
+        Selects connectors with chained filters, evaluated against the bulk connectors listing.
+
+        :rtype: kafka_connect_api.query.ConnectorQuery
+        """
+        from .query import ConnectorQuery
+
+        return ConnectorQuery(self)
+
+    def iter_connectors(self, expand: tuple = ("info", "status")) -> Generator:
+        """
+        Streams the connectors listing, expanded with the info and/or status of each connector.
+
+        :param tuple expand: details to include, info and/or status
+        :return: (name, {"info": dict, "status": dict}) for each connector, as the response is received
+        """
+        _expand = "&".join(f"expand={detail}" for detail in expand)
+        return self._api.stream(f"/connectors?{_expand}")
+
+    @property
+    def statuses(self) -> dict:
+        """
+        Status of all the connectors and their tasks, in one request.
+
+        :return: the status of each connector, by connector name
+        """
+        _statuses = self._api.get("/connectors?expand=status")
+        return {name: _connector["status"] for name, _connector in _statuses.items()}
+
+    def placement(self, heavy_tasks: int = 4) -> PlacementReport:
+        """
+        Tasks and connectors per worker, and how unevenly they are spread, from one status request.
+
+        :param int heavy_tasks: Number of tasks from which a connector is considered heavy
+        :rtype: PlacementReport
+        """
+        return PlacementReport(self.statuses, heavy_tasks)
+
+    def failures(self) -> FailureReport:
+        """
+        FAILED connectors and tasks grouped by exception signature, from one status request.
+
+        :rtype: FailureReport
+        """
+        return FailureReport(self, self.statuses)
+
     @property
     def loggers(self) -> dict:
-        return self._api.get("/admin/loggers")
+        return self.get_loggers()
+
+    def get_loggers(self, max_age: float = 0) -> dict:
+        """
+        The loggers of the cluster. The listing is reused if retrieved less than max_age seconds ago.
+
+        :param float max_age: Maximum age, in seconds, of the listing to reuse. 0 to always retrieve it.
+        :rtype: dict
+        """
+        with self._loggers_lock:
+            if (
+                max_age
+                and self._loggers is not None
+                and monotonic() - self._loggers_retrieved_at < max_age
+            ):
+                return deepcopy(self._loggers)
+        _loggers = self._api.get("/admin/loggers")
+        with self._loggers_lock:
+            self._loggers = deepcopy(_loggers)
+            self._loggers_retrieved_at = monotonic()
+        return _loggers
 
     @property
     def root_logger(self):
-        return self.loggers["root"]
+        return self._api.get("/admin/loggers/root")
 
     @root_logger.setter
     def root_logger(self, log_level: str) -> None:
@@ -212,16 +339,126 @@ class Cluster:
     def set_logger_log_level(self, logger_name: str, log_level: str) -> dict:
         if log_level not in LOG_LEVELS:
             raise ValueError(log_level, "not valid. Must be one of", LOG_LEVELS)
-        if logger_name not in self.loggers.keys():
+        _loggers = self.get_loggers(max_age=LOGGERS_CACHE_TTL)
+        if logger_name not in _loggers.keys():
             raise ValueError(
                 logger_name,
                 "Logger not found on the cluster. Valid loggers",
-                list(self.loggers.keys()),
+                list(_loggers.keys()),
             )
         return self._api.put(f"/admin/loggers/{logger_name}", json={"level": log_level})
 
+    def supports_cluster_scope_loggers(self) -> Union[bool, None]:
+        """
+        Whether the cluster sets loggers levels on all workers at once (KIP-976, Apache Kafka 3.7+).
+        Detected from the responses to the first cluster scope change, as the version reported by the
+        workers does not map to the Apache Kafka version for all distributions. None until then.
+        """
+        return self._cluster_scope_loggers
+
+    def set_log_levels(
+        self, levels: dict, scope: str = None, max_workers: int = None
+    ) -> dict:
+        """
+        Sets the level of several loggers at once. The loggers are validated against one cached listing,
+        and the levels are set concurrently.
+
+        :param dict levels: The level to set, by logger name
+        :param str scope: Set to ``cluster`` to set the levels on all the workers (KIP-976). Workers that do
+          not support it ignore the scope and only set their own levels, which is detected from their response.
+          The following changes are then set on the worker only.
+        :param int max_workers: Maximum number of loggers to set at once
+        :return: the loggers set, the error for the others, and the scope (cluster or worker) they were set on
+        :rtype: dict
+        """
+        invalid_levels = {
+            name: level for name, level in levels.items() if level not in LOG_LEVELS
+        }
+        if invalid_levels:
+            raise ValueError(invalid_levels, "not valid. Must be one of", LOG_LEVELS)
+        _loggers = self.get_loggers(max_age=LOGGERS_CACHE_TTL)
+        unknown = [name for name in levels if name not in _loggers]
+        if unknown:
+            raise ValueError(
+                unknown,
+                "Loggers not found on the cluster. Valid loggers",
+                list(_loggers.keys()),
+            )
+        if scope is not None and scope not in ["cluster", "worker"]:
+            raise ValueError(
+                "scope must be one of", ["cluster", "worker"], "got", scope
+            )
+        query = ""
+        if scope == "cluster":
+            if self._cluster_scope_loggers is False:
+                LOG.warning(
+                    f"{self._api.url} - cluster scope for loggers is not supported (KIP-976)."
+                    " Setting levels on the worker only"
+                )
+            else:
+                query = "?scope=cluster"
+
+        def _set_level(name):
+            return self._api.put_raw(
+                f"/admin/loggers/{name}{query}", json={"level": levels[name]}
+            )
+
+        results: dict = {"succeeded": [], "failed": {}}
+        status_codes: set = set()
+        for name, req, error in run_concurrently(_set_level, levels, max_workers):
+            if error:
+                results["failed"][name] = str(error)
+            else:
+                results["succeeded"].append(name)
+                status_codes.add(req.status_code)
+        if query and status_codes:
+            # Cluster scope changes return 204 No Content, worker scope changes return the loggers changed
+            self._cluster_scope_loggers = status_codes == {204}
+            if not self._cluster_scope_loggers:
+                LOG.warning(
+                    f"{self._api.url} - cluster scope for loggers is not supported (KIP-976)."
+                    f" {results['succeeded']} were set on the worker only"
+                )
+        results["scope"] = (
+            "cluster" if query and self._cluster_scope_loggers else "worker"
+        )
+        with self._loggers_lock:
+            if self._loggers is not None:
+                for name in results["succeeded"]:
+                    self._loggers.setdefault(name, {})["level"] = levels[name]
+        return results
+
+    def temporary_log_levels(
+        self, levels: dict, duration: float = None, scope: str = None
+    ) -> TemporaryLogLevels:
+        """
+        Sets the levels of loggers and reverts them to their previous level after duration seconds,
+        or when leaving the ``with`` block.
+
+        :param dict levels: The level to set, by logger name
+        :param float duration: Seconds after which the previous levels are restored
+        :param str scope: See set_log_levels
+        :rtype: TemporaryLogLevels
+        """
+        return TemporaryLogLevels(self, levels, duration, scope).apply()
+
     def __repr__(self):
-        return f"{self._api.url} - {self.version} - {self.kafka_cluster}"
+        _cluster = self.get()
+        return (
+            f"{self._api.url} - {_cluster['version']} - {_cluster['kafka_cluster_id']}"
+        )
+
+
+class InFlightRequest:
+    """
+    Holds a GET request in progress, shared with the callers requesting the same path meanwhile.
+    """
+
+    def __init__(self):
+        self.done = Event()
+        self.waiters: int = 0
+        self.result = None
+        self.error = None
 
 
 class Api:
@@ -238,6 +475,10 @@ class Api:
         ignore_ssl_errors: bool = False,
         username: str = None,
         password: str = None,
+        coalesce_requests: bool = True,
+        json_codec: Union[str, JsonCodec] = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
     ):
         """
 
@@ -247,6 +488,10 @@ class Api:
         :param bool ignore_ssl_errors: Ignore SSL errors, for self-signed endpoints. Use at own risks
         :param str username: Username used for basic auth
         :param str password: Password used for basic auth
+        :param bool coalesce_requests: Concurrent GET for the same path share one request and its result
+        :param json_codec: JSON codec name (orjson, ujson, json) or JsonCodec. Defaults to the fastest installed
+        :param float connect_timeout: Seconds to wait for the connection to the cluster
+        :param float read_timeout: Seconds to wait for the cluster to respond
         """
         if (username and not password) or (password and not username):
             raise ValueError("You must specify both username and password")
@@ -266,10 +511,37 @@ class Api:
             "Content-type": "application/json",
             "Accept": "application/json",
         }
+        self.json_codec = get_json_codec(json_codec)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.coalesce_requests = coalesce_requests
+        self.coalescing_stats: dict = {"requests": 0, "coalesced": 0}
+        self._inflight: dict = {}
+        self._inflight_lock = Lock()
+        self._recorders: list = []
 
     def __repr__(self):
         return self.url
 
+    @property
+    def timeout(self) -> tuple:
+        """The (connect, read) timeouts of requests"""
+        return self.connect_timeout, self.read_timeout
+
+    def request_timeout(self) -> tuple:
+        """
+        The (connect, read) timeouts, capped by the remaining time of the current deadline
+
+        :raises DeadlineExceeded: if the current deadline passed
+        """
+        deadline = current_deadline()
+        if deadline is None or deadline.expires_at is None:
+            return self.timeout
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("The operation deadline passed")
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
     @property
     def verify_ssl(self) -> bool:
         if not self._ignore_ssl_errors and self.protocol == "http":
@@ -350,77 +622,195 @@ class Api:
             )
         self._port = value
 
-    @evaluate_api_return
-    def get_raw(self, query_path, **kwargs) -> Response:
+    def _request(self, method: str, query_path: str, **kwargs) -> Response:
         if not query_path.startswith(r"/"):
             query_path = f"/{query_path}"
         url = f"{self.url}{query_path}"
-        req = get(
-            url,
-            auth=self.basic_auth,
-            headers=self.headers,
-            verify=self.verify_ssl,
-            **kwargs,
-        )
-        return req
+        if "json" in kwargs:
+            kwargs["data"] = self.json_codec.dumps(kwargs.pop("json"))
+        capped = False
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self.request_timeout()
+            capped = kwargs["timeout"] != self.timeout
+        start = monotonic()
+        status_code = None
+        try:
+            req = request(
+                method,
+                url,
+                auth=self.basic_auth,
+                headers=self.headers,
+                verify=self.verify_ssl,
+                **kwargs,
+            )
+            status_code = req.status_code
+            return req
+        except Timeout as error:
+            deadline = current_deadline()
+            if capped and deadline is not None and deadline.expired:
+                raise DeadlineExceeded(
+                    f"The operation deadline passed during {method} {query_path}"
+                ) from error
+            raise
+        finally:
+            if method != "GET":
+                self.evict_inflight()
+            if self._recorders:
+                recorded = RecordedRequest(
+                    method,
+                    query_path,
+                    route_template(query_path),
+                    status_code,
+                    monotonic() - start,
+                    find_caller(),
+                )
+                for recorder in self._recorders:
+                    recorder.add(recorded)
+
+    def batch(self, max_workers: int = None) -> WriteBatch:
+        """
+        Builder of write operations, executed concurrently unless they depend on each other.
+
+        :param int max_workers: Maximum number of operations running at once
+        :rtype: WriteBatch
+        """
+        return WriteBatch(self, max_workers)
+
+    def record(self, max_requests: int = None) -> RequestAudit:
+        """
+        Context manager recording the requests made with this Api while active.
+
+        :param int max_requests: When set, raises RequestBudgetExceeded on exit if more requests were made.
+        :rtype: RequestAudit
+        """
+        return RequestAudit(self, max_requests)
+
+    def add_recorder(self, recorder: RequestAudit) -> None:
+        with self._inflight_lock:
+            self._recorders = self._recorders + [recorder]
+
+    def remove_recorder(self, recorder: RequestAudit) -> None:
+        with self._inflight_lock:
+            self._recorders = [
+                _recorder for _recorder in self._recorders if _recorder is not recorder
+            ]
+
+    def evict_inflight(self) -> None:
+        """
+        Detaches the GET requests in flight, so that the GET calls made after a write send a new request
+        instead of getting the result of one that may have been sent before the write.
+        """
+        with self._inflight_lock:
+            self._inflight = {}
+
+    def decode(self, req: Response):
+        """Decodes the JSON body of the response with the JSON codec"""
+        return self.json_codec.loads(req.content)
+
+    @evaluate_api_return
+    def get_raw(self, query_path, **kwargs) -> Response:
+        return self._request("GET", query_path, **kwargs)
 
     def get(self, query_path):
-        req = self.get_raw(query_path)
-        return req.json()
+        """
+        GET the path and returns the parsed JSON. When coalesce_requests is set, concurrent calls for the same
+        path wait for the request already in flight and get a copy of its result, instead of sending another one.
+        Results are never kept once the request completed, and calls made after a PUT, POST or DELETE
+        completed never wait for a request sent before it.
+        A caller waits for the request in flight only until its own deadline. If the request in flight fails
+        because of the deadline of the caller that sent it, the callers waiting for it send the request again.
+        """
+        if not self.coalesce_requests:
+            return self.decode(self.get_raw(query_path))
+        while True:
+            with self._inflight_lock:
+                call = self._inflight.get(query_path)
+                leader = call is None
+                if leader:
+                    call = InFlightRequest()
+                    self._inflight[query_path] = call
+                    self.coalescing_stats["requests"] += 1
+                else:
+                    call.waiters += 1
+                    self.coalescing_stats["coalesced"] += 1
+            if leader:
+                return self._lead_get(query_path, call)
+            deadline = current_deadline()
+            if not call.done.wait(deadline.remaining() if deadline else None):
+                raise DeadlineExceeded(
+                    f"The operation deadline passed waiting for GET {query_path}"
+                )
+            if isinstance(call.error, DeadlineExceeded):
+                continue
+            if call.error:
+                raise call.error
+            return deepcopy(call.result)
+
+    def _lead_get(self, query_path, call: InFlightRequest):
+        result = None
+        try:
+            result = self.decode(self.get_raw(query_path))
+            return result
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._inflight_lock:
+                if self._inflight.get(query_path) is call:
+                    del self._inflight[query_path]
+            if call.waiters and not call.error:
+                call.result = deepcopy(result)
+            call.done.set()
+
+    def stream(self, query_path, chunk_size: int = 65536) -> Generator:
+        """
+        GET the path and parses the response as it is received. Yields the items of a JSON array,
+        or the (key, value) pairs of a JSON object, so that only one item at a time is held in memory.
+        The response is closed when the generator is exhausted or closed.
+        Raises DeadlineExceeded once the current deadline passed while reading the response.
+
+        :param str query_path:
+        :param int chunk_size: Size of the chunks of the response body read at once.
+        """
+        req = self.get_raw(query_path, stream=True)
+        deadline = current_deadline()
+        try:
+            for item in iter_json_items(req.iter_content(chunk_size)):
+                yield item
+                if deadline is not None:
+                    deadline.check()
+        except RequestException as error:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(
+                    f"The operation deadline passed reading GET {query_path}"
+                ) from error
+            raise
+        finally:
+            req.close()
 
     @evaluate_api_return
     def post_raw(self, query_path, **kwargs) -> Response:
-        if not query_path.startswith(r"/"):
-            query_path = f"/{query_path}"
-        url = f"{self.url}{query_path}"
-        req = post(
-            url,
-            auth=self.basic_auth,
-            headers=self.headers,
-            verify=self.verify_ssl,
-            **kwargs,
-        )
-        return req
+        return self._request("POST", query_path, **kwargs)
 
     def post(self, query_path, **kwargs):
         req = self.post_raw(query_path, **kwargs)
         try:
-            return req.json()
+            return self.decode(req)
         except ValueError:
             return req
 
     @evaluate_api_return
     def put_raw(self, query_path, **kwargs) -> Response:
-        if not query_path.startswith(r"/"):
-            query_path = f"/{query_path}"
-        url = f"{self.url}{query_path}"
-        req = put(
-            url,
-            auth=self.basic_auth,
-            headers=self.headers,
-            verify=self.verify_ssl,
-            **kwargs,
-        )
-        return req
+        return self._request("PUT", query_path, **kwargs)
 
     def put(self, query_path, **kwargs):
         req = self.put_raw(query_path, **kwargs)
-        return req.json()
+        return self.decode(req)
 
     @evaluate_api_return
     def delete_raw(self, query_path, **kwargs) -> Response:
-        if not query_path.startswith(r"/"):
-            query_path = f"/{query_path}"
-        url = f"{self.url}{query_path}"
-        req = delete(
-            url,
-            auth=self.basic_auth,
-            headers=self.headers,
-            verify=self.verify_ssl,
-            **kwargs,
-        )
-        return req
+        return self._request("DELETE", query_path, **kwargs)
 
     def delete(self, query_path):
         req = self.delete_raw(query_path)
-        return req.json()
+        return self.decode(req)
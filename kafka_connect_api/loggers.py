@@ -0,0 +1,107 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Temporary changes of the cluster loggers levels, i.e. raise to DEBUG for a few minutes then revert.
+
+.. code-block:: python
+
+    cluster.temporary_log_levels({"org.apache.kafka.connect": "DEBUG"}, duration=600)
+
+    with cluster.temporary_log_levels({"org.apache.kafka.connect": "DEBUG"}):
+        connector.cycle_connector()
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .kafka_connect_api import Cluster
+
+import logging
+from threading import Lock, Timer
+
+LOG = logging.getLogger(__name__)
+
+
+class TemporaryLogLevels:
+    """
+    Sets loggers levels, keeping track of their previous level to revert them, after duration seconds
+    if set, when leaving the ``with`` block, or when calling revert().
+    The timer runs in the current process: in AWS Lambda, call revert() before returning instead.
+    """
+
+    def __init__(
+        self, cluster: Cluster, levels: dict, duration: float = None, scope: str = None
+    ):
+        self._cluster = cluster
+        self.levels = levels
+        self.duration = duration
+        self.scope = scope
+        self.changed: dict = {}
+        self._timer: Timer = None
+        self._applied: bool = False
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"{self._cluster.api} - {self.changed}"
+
+    def __enter__(self) -> TemporaryLogLevels:
+        return self.apply()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.revert()
+
+    def apply(self) -> TemporaryLogLevels:
+        """
+        Records the current levels and sets the new ones. Starts the revert timer if duration is set.
+        Does nothing if the levels were already applied and not reverted since.
+
+        :raises ValueError: if a logger or level is not valid
+        """
+        if self._applied:
+            return self
+        _loggers = self._cluster.get_loggers()
+        results = self._cluster.set_log_levels(self.levels, self.scope)
+        with self._lock:
+            for name in results["succeeded"]:
+                previous = _loggers[name].get("level")
+                if previous and name not in self.changed:
+                    self.changed[name] = {"from": previous, "to": self.levels[name]}
+        self._applied = True
+        if results["failed"]:
+            LOG.error(
+                f"{self._cluster.api} - failed to set loggers {results['failed']}"
+            )
+        if self.duration is not None:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = Timer(self.duration, self.revert)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def revert(self) -> dict:
+        """
+        Restores the loggers changed to their previous level.
+
+        :return: the result of set_log_levels
+        :rtype: dict
+        """
+        if self._timer:
+            self._timer.cancel()
+        with self._lock:
+            changed = self.changed
+            self.changed = {}
+            self._applied = False
+        if not changed:
+            return {"succeeded": [], "failed": {}}
+        results = self._cluster.set_log_levels(
+            {name: change["from"] for name, change in changed.items()}, self.scope
+        )
+        if results["failed"]:
+            with self._lock:
+                for name in results["failed"]:
+                    self.changed[name] = changed[name]
+        return results
@@ -0,0 +1,140 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Placement of the connectors and tasks across the workers of the cluster, from the connectors statuses.
+"""
+
+from __future__ import annotations
+
+from math import ceil
+from statistics import mean, pstdev
+
+
+class PlacementReport:
+    """
+    Tasks and connectors per worker, and how unevenly they are spread.
+    Workers are only known from the statuses: a worker running no connector nor task is not listed.
+    """
+
+    def __init__(self, statuses: dict, heavy_tasks: int = 4):
+        """
+
+        :param dict statuses: The connectors statuses, by connector name, as returned by Cluster.statuses
+        :param int heavy_tasks: Number of tasks from which a connector is considered heavy
+        """
+        self.heavy_tasks = heavy_tasks
+        self.tasks_per_worker: dict = {}
+        self.connectors_per_worker: dict = {}
+        self.connector_tasks: dict = {}
+        for name, status in statuses.items():
+            worker_id = status["connector"].get("worker_id")
+            if worker_id:
+                self.connectors_per_worker[worker_id] = (
+                    self.connectors_per_worker.get(worker_id, 0) + 1
+                )
+                self.tasks_per_worker.setdefault(worker_id, 0)
+            _tasks: dict = {}
+            for task in status["tasks"]:
+                if not task.get("worker_id"):
+                    continue
+                _tasks[task["worker_id"]] = _tasks.get(task["worker_id"], 0) + 1
+                self.tasks_per_worker[task["worker_id"]] = (
+                    self.tasks_per_worker.get(task["worker_id"], 0) + 1
+                )
+                self.connectors_per_worker.setdefault(task["worker_id"], 0)
+            self.connector_tasks[name] = _tasks
+
+    def __repr__(self):
+        return f"{len(self.workers)} workers - skew {self.skew:.2f}"
+
+    @property
+    def workers(self) -> list:
+        return sorted(self.tasks_per_worker)
+
+    @property
+    def skew(self) -> float:
+        """
+        Tasks on the busiest worker over the average tasks per worker. 1.0 when perfectly balanced.
+        """
+        if not self.tasks_per_worker or not sum(self.tasks_per_worker.values()):
+            return 1.0
+        return max(self.tasks_per_worker.values()) / mean(
+            self.tasks_per_worker.values()
+        )
+
+    @property
+    def coefficient_of_variation(self) -> float:
+        """Standard deviation of the tasks per worker over the average. 0.0 when perfectly balanced."""
+        if not self.tasks_per_worker or not sum(self.tasks_per_worker.values()):
+            return 0.0
+        return pstdev(self.tasks_per_worker.values()) / mean(
+            self.tasks_per_worker.values()
+        )
+
+    @property
+    def heavy_connectors(self) -> dict:
+        """
+        Connectors with at least heavy_tasks tasks, with the worker running most of their tasks, and the
+        ratio of their tasks running on it. Sorted by descending concentration.
+        """
+        heavy: dict = {}
+        for name, _tasks in self.connector_tasks.items():
+            total = sum(_tasks.values())
+            if total < self.heavy_tasks:
+                continue
+            top_worker = max(_tasks, key=_tasks.get)
+            heavy[name] = {
+                "tasks": total,
+                "top_worker": top_worker,
+                "concentration": _tasks[top_worker] / total,
+            }
+        return dict(
+            sorted(
+                heavy.items(), key=lambda item: item[1]["concentration"], reverse=True
+            )
+        )
+
+    def suggest_restarts(self) -> list:
+        """
+        Suggests connectors to restart so that their tasks may be assigned to less busy workers.
+        For each worker running more tasks than the average (rounded up), picks the connectors with the
+        most tasks on that worker until the excess is covered. The assignment after restart is decided by
+        the cluster and is not guaranteed to be better.
+
+        :return: names of the connectors to restart
+        :rtype: list
+        """
+        if not self.tasks_per_worker:
+            return []
+        target = ceil(mean(self.tasks_per_worker.values()))
+        suggestions: list = []
+        for worker_id, tasks in sorted(
+            self.tasks_per_worker.items(), key=lambda item: item[1], reverse=True
+        ):
+            excess = tasks - target
+            if excess <= 0:
+                break
+            candidates = sorted(
+                (
+                    (_tasks[worker_id], name)
+                    for name, _tasks in self.connector_tasks.items()
+                    if _tasks.get(worker_id) and name not in suggestions
+                ),
+                reverse=True,
+            )
+            for count, name in candidates:
+                if excess <= 0:
+                    break
+                suggestions.append(name)
+                excess -= count
+        return suggestions
+
+    def to_dict(self) -> dict:
+        return {
+            "tasks_per_worker": self.tasks_per_worker,
+            "connectors_per_worker": self.connectors_per_worker,
+            "heavy_connectors": self.heavy_connectors,
+            "skew": self.skew,
+            "coefficient_of_variation": self.coefficient_of_variation,
+        }
@@ -0,0 +1,184 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Select connectors of a cluster with filters evaluated against the bulk connectors listing,
+without creating a Connector for each connector of the cluster.
+
+.. code-block:: python
+
+    failed_s3_sinks = cluster.query().name("s3-*").type("sink").task_state("FAILED")
+    failed_s3_sinks.restart()
+"""
+
+from __future__ import annotations
+
+import re
+from fnmatch import fnmatchcase
+from typing import Callable, Generator, Union
+
+from .kafka_connect_api import Cluster, Connector
+from .tools import run_concurrently
+
+ANY = object()
+
+
+class ConnectorQuery:
+    """
+    Lazy selection of connectors. Filters are chained, and only evaluated when iterating over the query.
+    The connectors listing is expanded with info and/or status only when a filter requires them, and is then
+    streamed: connectors are evaluated as the response is received, and first()/exists() stop reading it early.
+
+    The records passed to the filters are ``{"name": str, "info": dict, "status": dict}``
+    """
+
+    def __init__(self, cluster: Cluster):
+        self._cluster = cluster
+        self._filters: list = []
+        self._expand: set = set()
+
+    @property
+    def cluster(self) -> Cluster:
+        return self._cluster
+
+    def where(self, predicate: Callable, expand: tuple = ("info", "status")):
+        """
+        Adds a filter on the connector record.
+
+        :param predicate: callable taking the record as argument, returns True to keep the connector
+        :param tuple expand: The details (info, status) the predicate needs in the record
+        :return: self
+        """
+        self._filters.append(predicate)
+        self._expand.update(expand)
+        return self
+
+    def name(self, pattern: str):
+        """Connectors which name matches the glob pattern, i.e. ``s3-*``"""
+        return self.where(lambda record: fnmatchcase(record["name"], pattern), ())
+
+    def name_regex(self, regex: Union[str, re.Pattern]):
+        """Connectors which name matches the regular expression"""
+        _regex = re.compile(regex) if isinstance(regex, str) else regex
+        return self.where(lambda record: bool(_regex.search(record["name"])), ())
+
+    def connector_class(self, connector_class: str):
+        """Connectors of the given class. Matches the fully qualified name, or the class name only"""
+        return self.where(
+            lambda record: connector_class
+            in [
+                record["info"]["config"].get("connector.class"),
+                record["info"]["config"].get("connector.class", "").split(".")[-1],
+            ],
+            ("info",),
+        )
+
+    def type(self, connector_type: str):
+        """Connectors of type source or sink"""
+        return self.where(
+            lambda record: record["status"].get("type") == connector_type.lower(),
+            ("status",),
+        )
+
+    def state(self, *states: str):
+        """Connectors in one of the given states"""
+        return self.where(
+            lambda record: record["status"]["connector"]["state"] in states,
+            ("status",),
+        )
+
+    def task_state(self, *states: str):
+        """Connectors with at least one task in one of the given states"""
+        return self.where(
+            lambda record: any(
+                task["state"] in states for task in record["status"]["tasks"]
+            ),
+            ("status",),
+        )
+
+    def config(self, key: str, value=ANY):
+        """
+        Connectors with the config key set. If value is set, the config value must be equal to it, or,
+        if value is callable, value(config_value) must return True.
+        """
+
+        def _matches(record) -> bool:
+            config = record["info"]["config"]
+            if key not in config:
+                return False
+            if value is ANY:
+                return True
+            if callable(value):
+                return bool(value(config[key]))
+            return config[key] == value
+
+        return self.where(_matches, ("info",))
+
+    def _listing(self) -> Generator[dict, None, None]:
+        if not self._expand:
+            for name in self.cluster.api.get("/connectors"):
+                yield {"name": name}
+            return
+        _listing = self.cluster.iter_connectors(tuple(sorted(self._expand)))
+        try:
+            for name, details in _listing:
+                yield dict(details, name=name)
+        finally:
+            _listing.close()
+
+    def records(self) -> Generator[dict, None, None]:
+        """Yields the records of the connectors matching all filters"""
+        for record in self._listing():
+            if all(_filter(record) for _filter in self._filters):
+                yield record
+
+    def __iter__(self) -> Generator[Connector, None, None]:
+        for record in self.records():
+            yield Connector(self.cluster, record["name"])
+
+    def names(self) -> list:
+        return [record["name"] for record in self.records()]
+
+    def to_dict(self) -> dict:
+        """Same as Cluster.connectors, for the selected connectors only"""
+        return {connector.name: connector for connector in self}
+
+    def first(self) -> Union[Connector, None]:
+        """The first connector matching the filters, or None. Stops evaluating at the first match."""
+        return next(iter(self), None)
+
+    def exists(self) -> bool:
+        return self.first() is not None
+
+    def count(self) -> int:
+        return sum(1 for _ in self.records())
+
+    def apply(self, action: Callable, max_workers: int = None) -> dict:
+        """
+        Runs action against each selected connector, concurrently.
+
+        :param action: callable taking the Connector as argument
+        :param int max_workers:
+        :return: the names of connectors the action succeeded for, and the error for the others
+        :rtype: dict
+        """
+        results: dict = {"succeeded": [], "failed": {}}
+        for connector, _, error in run_concurrently(action, list(self), max_workers):
+            if error:
+                results["failed"][connector.name] = str(error)
+            else:
+                results["succeeded"].append(connector.name)
+        return results
+
+    def pause(self, max_workers: int = None) -> dict:
+        return self.apply(lambda connector: connector.pause(), max_workers)
+
+    def resume(self, max_workers: int = None) -> dict:
+        return self.apply(lambda connector: connector.resume(), max_workers)
+
+    def restart(self, max_workers: int = None) -> dict:
+        return self.apply(lambda connector: connector.restart(), max_workers)
+
+    def cycle(self, max_workers: int = None) -> dict:
+        """Cycles the connectors through pause / restart all tasks / resume"""
+        return self.apply(lambda connector: connector.cycle_connector(), max_workers)
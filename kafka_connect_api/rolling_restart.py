@@ -0,0 +1,243 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Restart connectors or tasks in waves, waiting for each wave to be RUNNING before starting the next one,
+to avoid restarting everything at once and causing a rebalance storm across the cluster.
+"""
+
+from __future__ import annotations
+
+import logging
+from time import monotonic, sleep
+
+from .deadline import current_deadline
+from .errors import DeadlineExceeded
+from .kafka_connect_api import Cluster, Connector
+from .tools import run_concurrently
+
+LOG = logging.getLogger(__name__)
+
+
+def is_failed(status: dict) -> bool:
+    """Whether the connector or any of its tasks is FAILED"""
+    return status["connector"]["state"] == "FAILED" or any(
+        task["state"] == "FAILED" for task in status["tasks"]
+    )
+
+
+def is_running(status: dict) -> bool:
+    """Whether the connector and all of its tasks are RUNNING"""
+    return status["connector"]["state"] == "RUNNING" and all(
+        task["state"] == "RUNNING" for task in status["tasks"]
+    )
+
+
+class RollingRestart:
+    """
+    Restarts connectors (pause / restart all tasks / resume) or individual tasks, ``wave_size`` at a time.
+    Connectors or tasks that are FAILED are restarted first.
+    After each wave, waits up to ``wave_timeout`` seconds for the wave to be RUNNING.
+    Stops once the ratio of restarted items that did not come back RUNNING exceeds ``max_failure_rate``,
+    or when the current operation deadline passed.
+    """
+
+    def __init__(
+        self,
+        cluster: Cluster,
+        connectors: list = None,
+        wave_size: int = 1,
+        wave_timeout: float = 120.0,
+        poll_interval: float = 5.0,
+        max_failure_rate: float = 0.5,
+        tasks_only: bool = False,
+    ):
+        """
+
+        :param Cluster cluster:
+        :param list connectors: Names of the connectors to restart. Defaults to all connectors in the cluster
+        :param int wave_size: Number of connectors (or tasks) to restart at once
+        :param float wave_timeout: Seconds to wait for a wave to be RUNNING before moving on
+        :param float poll_interval: Seconds between two status checks of a wave
+        :param float max_failure_rate: Ratio (0 to 1) of failed restarts that stops the rolling restart
+        :param bool tasks_only: Restart tasks individually instead of cycling the connectors
+        """
+        if wave_size < 1:
+            raise ValueError("wave_size must be at least 1. Got", wave_size)
+        if not (0 <= max_failure_rate <= 1):
+            raise ValueError(
+                "max_failure_rate must be between 0 and 1. Got", max_failure_rate
+            )
+        self._cluster = cluster
+        self.connectors = connectors
+        self.wave_size = wave_size
+        self.wave_timeout = wave_timeout
+        self.poll_interval = poll_interval
+        self.max_failure_rate = max_failure_rate
+        self.tasks_only = tasks_only
+        self.failed_connectors: set = set()
+
+    @property
+    def cluster(self) -> Cluster:
+        return self._cluster
+
+    def plan(self, statuses: dict = None) -> list:
+        """
+        Lists the items to restart, FAILED ones first, grouped in waves.
+        Items are the connector name, or (connector name, task id) when restarting tasks only.
+
+        :param dict statuses: The connectors statuses. Retrieved from the cluster if not set.
+        :return: the waves of items to restart
+        :rtype: list[list]
+        """
+        if statuses is None:
+            statuses = self.cluster.statuses
+        self.failed_connectors = {
+            name
+            for name, status in statuses.items()
+            if status["connector"]["state"] == "FAILED"
+        }
+        names = self.connectors if self.connectors is not None else list(statuses)
+        failed: list = []
+        others: list = []
+        for name in names:
+            if name not in statuses:
+                raise KeyError(f"Connector {name} is not present in {self.cluster.api}")
+            status = statuses[name]
+            if self.tasks_only:
+                for task in status["tasks"]:
+                    item = (name, task["id"])
+                    (failed if task["state"] == "FAILED" else others).append(item)
+            else:
+                (failed if is_failed(status) else others).append(name)
+        items = failed + others
+        return [
+            items[index : index + self.wave_size]
+            for index in range(0, len(items), self.wave_size)
+        ]
+
+    def restart_item(self, item) -> None:
+        """
+        Restarts the task, or cycles the connector. A FAILED connector is restarted first, as resuming it
+        does not bring it back to RUNNING.
+        """
+        if self.tasks_only:
+            self.cluster.api.post_raw(f"/connectors/{item[0]}/tasks/{item[1]}/restart")
+            return
+        if item in self.failed_connectors:
+            self.cluster.api.post_raw(f"/connectors/{item}/restart")
+        Connector(self.cluster, item).cycle_connector()
+
+    def item_is_running(self, item, statuses: dict) -> bool:
+        if self.tasks_only:
+            if item[0] not in statuses:
+                return False
+            for task in statuses[item[0]]["tasks"]:
+                if task["id"] == item[1]:
+                    return task["state"] == "RUNNING"
+            return False
+        return item in statuses and is_running(statuses[item])
+
+    def wait_for_wave(self, wave: list) -> list:
+        """
+        Waits for the items of the wave to be RUNNING, up to wave_timeout seconds, or until the current
+        operation deadline passed.
+
+        :param list wave:
+        :return: the items that are not RUNNING
+        :rtype: list
+        """
+        expiry = monotonic() + self.wave_timeout
+        deadline = current_deadline()
+        if deadline and deadline.expires_at is not None:
+            expiry = min(expiry, deadline.expires_at)
+        while True:
+            statuses = self.cluster.statuses
+            pending = [
+                item for item in wave if not self.item_is_running(item, statuses)
+            ]
+            if not pending or monotonic() >= expiry:
+                return pending
+            sleep(min(self.poll_interval, max(expiry - monotonic(), 0)))
+
+    def run(self) -> dict:
+        """
+        Restarts the connectors/tasks wave after wave.
+
+        :return: The restarted, failed, skipped and unverified (restarted, but the deadline passed before
+          checking) items, and the reason the restart was aborted, if it was.
+        :rtype: dict
+        """
+        report: dict = {
+            "restarted": [],
+            "failed": [],
+            "skipped": [],
+            "unverified": [],
+            "aborted": False,
+            "reason": None,
+        }
+        deadline = current_deadline()
+        try:
+            waves = self.plan()
+        except DeadlineExceeded:
+            LOG.error(
+                f"{self.cluster.api} - deadline passed before planning the restart"
+            )
+            report.update(aborted=True, reason="deadline")
+            return report
+        for wave_index, wave in enumerate(waves):
+            if deadline and deadline.expired:
+                LOG.error(
+                    f"{self.cluster.api} - deadline passed. Stopping rolling restart"
+                )
+                report.update(aborted=True, reason="deadline")
+                for remaining in waves[wave_index:]:
+                    report["skipped"] += remaining
+                break
+            LOG.info(
+                f"{self.cluster.api} - wave {wave_index + 1}/{len(waves)} - {wave}"
+            )
+            restartable: list = []
+            for item, _, error in run_concurrently(self.restart_item, wave):
+                if isinstance(error, DeadlineExceeded):
+                    report["skipped"].append(item)
+                elif error:
+                    LOG.error(f"{item} - restart failed - {error}")
+                    report["failed"].append(item)
+                else:
+                    restartable.append(item)
+            try:
+                not_running = self.wait_for_wave(restartable) if restartable else []
+                deadline_passed = bool(not_running) and deadline and deadline.expired
+            except DeadlineExceeded:
+                not_running = restartable
+                deadline_passed = True
+            for item in restartable:
+                if item in not_running and deadline_passed:
+                    LOG.warning(f"{item} - not RUNNING yet when the deadline passed")
+                    report["unverified"].append(item)
+                elif item in not_running:
+                    LOG.error(f"{item} - not RUNNING after {self.wave_timeout}s")
+                    report["failed"].append(item)
+                else:
+                    report["restarted"].append(item)
+            if deadline_passed:
+                LOG.error(
+                    f"{self.cluster.api} - deadline passed. Stopping rolling restart"
+                )
+                report.update(aborted=True, reason="deadline")
+                for remaining in waves[wave_index + 1 :]:
+                    report["skipped"] += remaining
+                break
+            processed = len(report["restarted"]) + len(report["failed"])
+            failure_rate = len(report["failed"]) / processed if processed else 0
+            if failure_rate > self.max_failure_rate:
+                LOG.error(
+                    f"{self.cluster.api} - failure rate {failure_rate:.2f} is above {self.max_failure_rate}."
+                    " Stopping rolling restart"
+                )
+                report.update(aborted=True, reason="failure_rate")
+                for remaining in waves[wave_index + 1 :]:
+                    report["skipped"] += remaining
+                break
+        return report
@@ -0,0 +1,247 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Snapshots of the connectors configurations & statuses of a cluster, saved to disk, so that the next
+run (i.e. the next Lambda invocation on a warm container) starts from the previous state, and to compare
+the state of a cluster at different times offline.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .kafka_connect_api import Cluster
+
+import gzip
+import json
+from hashlib import sha1
+from os import makedirs, path, replace
+from time import time
+
+from .json_codec import get_json_codec
+from .tools import cache_file_path, run_concurrently
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAX_AGE = 3600.0
+
+
+def content_hash(payload) -> str:
+    """
+    :return: a hash of the payload content, independent of the keys order
+    :rtype: str
+    """
+    return sha1(
+        json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def default_snapshot_path(url: str) -> str:
+    """
+    Path of the snapshot file for the cluster URL. In /tmp when running in AWS Lambda,
+    otherwise in the user cache directory.
+
+    :param str url: the cluster URL
+    :rtype: str
+    """
+    return cache_file_path(url, ".json.gz")
+
+
+def connector_record(info: dict, status: dict) -> dict:
+    return {
+        "config": info["config"],
+        "type": info.get("type"),
+        "tasks": len(info["tasks"]),
+        "status": status,
+        "config_hash": content_hash(info["config"]),
+        "status_hash": content_hash(status),
+    }
+
+
+class ClusterSnapshot:
+    """
+    Configuration and status of all the connectors of a cluster at a given time.
+    Connectors are stored as {name: {"config", "type", "tasks", "status", "config_hash", "status_hash"}}
+    full_taken_at is the time the configurations of all connectors were last retrieved.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        connectors: dict = None,
+        taken_at: float = None,
+        full_taken_at: float = None,
+    ):
+        self.url = url
+        self.connectors = connectors if connectors is not None else {}
+        self.taken_at = taken_at if taken_at is not None else time()
+        self.full_taken_at = (
+            full_taken_at if full_taken_at is not None else self.taken_at
+        )
+
+    def __repr__(self):
+        return f"{self.url} - {len(self.connectors)} connectors - {self.taken_at}"
+
+    @classmethod
+    def take(cls, cluster: Cluster) -> ClusterSnapshot:
+        """
+        Snapshot of the cluster, from one request for all the connectors configs and statuses.
+
+        :param Cluster cluster:
+        :rtype: ClusterSnapshot
+        """
+        return cls(
+            cluster.api.url,
+            {
+                name: connector_record(_connector["info"], _connector["status"])
+                for name, _connector in cluster.iter_connectors(("info", "status"))
+            },
+        )
+
+    def refresh(self, cluster: Cluster, full: bool = False) -> dict:
+        """
+        Updates the snapshot from the cluster and returns what changed.
+        Unless full is set, only the statuses of all connectors are retrieved, in one request, and
+        the configuration of connectors that are new, or whose number of tasks changed.
+        Configuration changes that do not change the tasks are only detected with full.
+
+        :param Cluster cluster:
+        :param bool full: Retrieve the configuration and status of all connectors
+        :return: the changes, as returned by diff
+        :rtype: dict
+        """
+        previous = ClusterSnapshot(
+            self.url, self.connectors, self.taken_at, self.full_taken_at
+        )
+        if full:
+            latest = ClusterSnapshot.take(cluster)
+            self.connectors = latest.connectors
+            self.taken_at = latest.taken_at
+            self.full_taken_at = latest.full_taken_at
+            return previous.diff(self)
+        taken_at = time()
+        statuses = cluster.statuses
+        connectors: dict = {}
+        to_fetch: list = []
+        for name, status in statuses.items():
+            known = self.connectors.get(name)
+            if not known or known["tasks"] != len(status["tasks"]):
+                to_fetch.append(name)
+                continue
+            connectors[name] = dict(
+                known, status=status, status_hash=content_hash(status)
+            )
+        for name, info, error in run_concurrently(
+            lambda _name: cluster.api.get(f"/connectors/{_name}"), to_fetch
+        ):
+            if error:
+                raise error
+            connectors[name] = connector_record(info, statuses[name])
+        self.connectors = connectors
+        self.taken_at = taken_at
+        return previous.diff(self)
+
+    def diff(self, other: ClusterSnapshot) -> dict:
+        """
+        Compares this snapshot with a later one.
+
+        :param ClusterSnapshot other:
+        :return: the connectors added, removed, with a changed config, and with a changed status
+        :rtype: dict
+        """
+        common = set(self.connectors).intersection(other.connectors)
+        return {
+            "added": sorted(set(other.connectors).difference(self.connectors)),
+            "removed": sorted(set(self.connectors).difference(other.connectors)),
+            "config_changed": sorted(
+                name
+                for name in common
+                if self.connectors[name]["config_hash"]
+                != other.connectors[name]["config_hash"]
+            ),
+            "status_changed": sorted(
+                name
+                for name in common
+                if self.connectors[name]["status_hash"]
+                != other.connectors[name]["status_hash"]
+            ),
+        }
+
+    def save(self, file_path: str = None) -> str:
+        """
+        Writes the snapshot, gzip compressed. The file is replaced atomically.
+
+        :param str file_path: Defaults to default_snapshot_path
+        :return: the path of the snapshot file
+        :rtype: str
+        """
+        file_path = file_path or default_snapshot_path(self.url)
+        makedirs(path.dirname(path.abspath(file_path)), exist_ok=True)
+        content = get_json_codec().dumps(
+            {
+                "version": SNAPSHOT_VERSION,
+                "url": self.url,
+                "taken_at": self.taken_at,
+                "full_taken_at": self.full_taken_at,
+                "connectors": self.connectors,
+            }
+        )
+        tmp_path = f"{file_path}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=5) as snapshot_fd:
+            snapshot_fd.write(content)
+        replace(tmp_path, file_path)
+        return file_path
+
+    @classmethod
+    def load(cls, file_path: str) -> ClusterSnapshot:
+        """
+        :param str file_path:
+        :rtype: ClusterSnapshot
+        """
+        with gzip.open(file_path, "rb") as snapshot_fd:
+            content = get_json_codec().loads(snapshot_fd.read())
+        if content.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                file_path,
+                "snapshot version is not supported. Got",
+                content.get("version"),
+                "expected",
+                SNAPSHOT_VERSION,
+            )
+        return cls(
+            content["url"],
+            content["connectors"],
+            content["taken_at"],
+            content.get("full_taken_at"),
+        )
+
+    @classmethod
+    def load_or_take(
+        cls, cluster: Cluster, file_path: str = None, max_age: float = SNAPSHOT_MAX_AGE
+    ) -> ClusterSnapshot:
+        """
+        Loads the snapshot of the cluster from disk and refreshes it, or takes a new one if there is none.
+        The refresh is full if the configurations were last all retrieved more than max_age seconds ago,
+        so that configuration changes that do not change the tasks are picked up.
+        The snapshot is saved after refresh.
+
+        :param Cluster cluster:
+        :param str file_path: Defaults to default_snapshot_path
+        :param float max_age: Seconds after which the refresh is full. None to always refresh incrementally
+        :rtype: ClusterSnapshot
+        """
+        file_path = file_path or default_snapshot_path(cluster.api.url)
+        try:
+            snapshot = cls.load(file_path)
+        except (OSError, ValueError, KeyError):
+            snapshot = None
+        if snapshot is None or snapshot.url != cluster.api.url:
+            snapshot = cls.take(cluster)
+        else:
+            snapshot.refresh(
+                cluster,
+                full=max_age is not None and time() - snapshot.full_taken_at >= max_age,
+            )
+        snapshot.save(file_path)
+        return snapshot
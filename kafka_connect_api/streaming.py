@@ -0,0 +1,106 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Incremental parsing of JSON responses, to process the items of large listings (i.e. /connectors?expand=status)
+as they are received, without holding the whole response body nor the whole parsed payload in memory.
+"""
+
+from __future__ import annotations
+
+import json
+from codecs import getincrementaldecoder
+from typing import Generator, Iterable, Union
+
+WHITESPACE = " \t\n\r"
+VALUE_TERMINATORS = WHITESPACE + ",:]}"
+
+_DECODER = json.JSONDecoder()
+
+
+class JsonItemsStream:
+    """
+    Iterates over the items of a top level JSON array, or the (key, value) pairs of a top level JSON object,
+    from chunks of UTF-8 encoded bytes. Only the item being parsed is kept in memory.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Reads the next chunk into the buffer. Returns False once all chunks were read"""
+        if self._eof:
+            return False
+        try:
+            text = self._decoder.decode(next(self._chunks))
+        except StopIteration:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return not self._eof
+
+    def _peek(self) -> Union[str, None]:
+        """Skips whitespaces and returns the next character, None at the end of the content"""
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill() and self._pos >= len(self._buffer):
+                return None
+
+    def _expect(self, characters: str) -> str:
+        character = self._peek()
+        if character is None or character not in characters:
+            raise ValueError(
+                f"Invalid JSON stream: expected one of {characters!r}, got {character!r}"
+            )
+        self._pos += 1
+        return character
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # A value not followed by a separator could be truncated, i.e. a number split across chunks.
+                if self._eof or (
+                    end < len(self._buffer) and self._buffer[end] in VALUE_TERMINATORS
+                ):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def __iter__(self) -> Generator:
+        opening = self._expect("[{")
+        closing = "]" if opening == "[" else "}"
+        if self._peek() == closing:
+            self._pos += 1
+            return
+        while True:
+            if opening == "{":
+                key = self._value()
+                self._expect(":")
+                yield key, self._value()
+            else:
+                yield self._value()
+            if self._expect(f",{closing}") == closing:
+                return
+
+
+def iter_json_items(chunks: Iterable[bytes]) -> Generator:
+    """
+    :param chunks: The JSON content, in chunks of bytes
+    :return: the items of the top level array, or the (key, value) of the top level object
+    """
+    return iter(JsonItemsStream(chunks))
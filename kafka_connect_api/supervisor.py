@@ -0,0 +1,271 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Supervisor restarting the FAILED tasks of a cluster, with a backoff per task, and quarantining the tasks
+that keep failing.
+
+.. code-block:: python
+
+    supervisor = Supervisor(cluster, on_event=print)
+    supervisor.run()
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from .kafka_connect_api import Cluster
+
+import json
+import logging
+from os import makedirs, path, replace
+from threading import Event
+from time import time
+
+from .tools import cache_file_path, run_concurrently
+
+LOG = logging.getLogger(__name__)
+
+
+class TaskHealth:
+    """
+    Restart history of one task, to compute its backoff and time to recovery.
+    The history is kept for restart_window once the task recovered, to detect crash loops.
+    """
+
+    def __init__(self, failed_at: float = None):
+        self.failed_at = failed_at
+        self.restarts: list = []
+        self.next_restart_at: float = failed_at or 0.0
+        self.quarantined: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "failed_at": self.failed_at,
+            "restarts": self.restarts,
+            "next_restart_at": self.next_restart_at,
+            "quarantined": self.quarantined,
+        }
+
+    @classmethod
+    def from_dict(cls, content: dict) -> TaskHealth:
+        health = cls(content["failed_at"])
+        health.restarts = content["restarts"]
+        health.next_restart_at = content["next_restart_at"]
+        health.quarantined = content["quarantined"]
+        return health
+
+
+class Supervisor:
+    """
+    Polls the statuses of all the connectors in one request, and restarts the FAILED tasks.
+
+    * A task is restarted again after base_backoff seconds, doubling at each restart up to max_backoff.
+    * A task restarted max_restarts times within restart_window seconds is quarantined: it is no longer
+      restarted until it recovers on its own or release() is called.
+    * Events are sent to on_event and logged as JSON: task_failed, task_restarted, task_restart_failed,
+      task_quarantined, task_recovered (with time_to_recovery, in seconds).
+    """
+
+    def __init__(
+        self,
+        cluster: Cluster,
+        base_backoff: float = 10.0,
+        max_backoff: float = 600.0,
+        max_restarts: int = 5,
+        restart_window: float = 3600.0,
+        on_event: Callable = None,
+        connectors: list = None,
+    ):
+        """
+
+        :param Cluster cluster:
+        :param float base_backoff: Seconds to wait before restarting a task again after its first restart
+        :param float max_backoff: Maximum seconds between two restarts of a task
+        :param int max_restarts: Number of restarts within restart_window after which a task is quarantined
+        :param float restart_window: Seconds over which restarts are counted
+        :param on_event: Callable receiving each event, as a dict
+        :param list connectors: Names of the connectors to supervise. Defaults to all
+        """
+        self._cluster = cluster
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.on_event = on_event
+        self.connectors = connectors
+        self.tasks: dict = {}
+        self._stop = Event()
+
+    @property
+    def cluster(self) -> Cluster:
+        return self._cluster
+
+    def emit(self, event_type: str, connector: str, task_id: int, **details) -> dict:
+        event = dict(
+            event=event_type,
+            cluster=self.cluster.api.url,
+            connector=connector,
+            task=task_id,
+            timestamp=time(),
+            **details,
+        )
+        LOG.info(json.dumps(event))
+        if self.on_event:
+            self.on_event(event)
+        return event
+
+    def backoff(self, restarts: int) -> float:
+        return min(self.base_backoff * (2 ** max(restarts - 1, 0)), self.max_backoff)
+
+    def restart_task(self, key: tuple) -> None:
+        self.cluster.api.post_raw(f"/connectors/{key[0]}/tasks/{key[1]}/restart")
+
+    def poll_once(self) -> list:
+        """
+        Checks all the tasks statuses once, and restarts the FAILED tasks that are due.
+        A task is recovered once seen RUNNING. The history of tasks that no longer exist is dropped.
+
+        :return: the events of this poll
+        :rtype: list[dict]
+        """
+        now = time()
+        events: list = []
+        statuses = self.cluster.statuses
+        states: dict = {}
+        for name, status in statuses.items():
+            if self.connectors is not None and name not in self.connectors:
+                continue
+            for task in status["tasks"]:
+                states[(name, task["id"])] = task["state"]
+        failed = {key for key, state in states.items() if state == "FAILED"}
+        for key, health in list(self.tasks.items()):
+            if key not in states:
+                del self.tasks[key]
+                continue
+            health.restarts = [
+                restarted_at
+                for restarted_at in health.restarts
+                if now - restarted_at < self.restart_window
+            ]
+            if states[key] == "FAILED":
+                continue
+            if health.failed_at is not None:
+                if states[key] != "RUNNING":
+                    continue
+                events.append(
+                    self.emit(
+                        "task_recovered",
+                        *key,
+                        time_to_recovery=now - health.failed_at,
+                        restarts=len(health.restarts),
+                    )
+                )
+                health.failed_at = None
+                health.quarantined = False
+            if not health.restarts:
+                del self.tasks[key]
+        to_restart: list = []
+        for key in sorted(failed):
+            health = self.tasks.setdefault(key, TaskHealth())
+            if health.failed_at is None:
+                health.failed_at = now
+                events.append(self.emit("task_failed", *key))
+            if health.quarantined or now < health.next_restart_at:
+                continue
+            if len(health.restarts) >= self.max_restarts:
+                health.quarantined = True
+                events.append(
+                    self.emit("task_quarantined", *key, restarts=len(health.restarts))
+                )
+                continue
+            to_restart.append(key)
+        for key, _, error in run_concurrently(self.restart_task, to_restart):
+            health = self.tasks[key]
+            health.restarts.append(now)
+            health.next_restart_at = now + self.backoff(len(health.restarts))
+            if error:
+                events.append(self.emit("task_restart_failed", *key, error=str(error)))
+            else:
+                events.append(
+                    self.emit(
+                        "task_restarted",
+                        *key,
+                        attempt=len(health.restarts),
+                        next_restart_at=health.next_restart_at,
+                    )
+                )
+        return events
+
+    def release(self, connector: str, task_id: int) -> None:
+        """Takes the task out of quarantine, so that it is restarted at the next poll"""
+        key = (connector, task_id)
+        if key in self.tasks:
+            self.tasks[key] = TaskHealth(self.tasks[key].failed_at)
+
+    @property
+    def quarantined(self) -> list:
+        return sorted(key for key, health in self.tasks.items() if health.quarantined)
+
+    def run(self, interval: float = 30.0, iterations: int = None) -> None:
+        """
+        Polls the cluster every interval seconds, until stop() is called or after iterations polls.
+        Errors while polling are logged, and do not stop the supervisor.
+
+        :param float interval: Seconds between two polls
+        :param int iterations: Number of polls to run. Runs until stopped if not set
+        """
+        self._stop.clear()
+        count = 0
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as error:
+                LOG.exception(f"{self.cluster.api} - supervisor poll failed - {error}")
+            count += 1
+            if iterations is not None and count >= iterations:
+                break
+            self._stop.wait(interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def state(self) -> dict:
+        """The tasks health, to be restored with load_state, i.e. between Lambda invocations"""
+        return {
+            f"{key[0]}/{key[1]}": health.to_dict() for key, health in self.tasks.items()
+        }
+
+    def load_state(self, state: dict) -> None:
+        self.tasks = {}
+        for key, content in state.items():
+            connector, _, task_id = key.rpartition("/")
+            self.tasks[(connector, int(task_id))] = TaskHealth.from_dict(content)
+
+    def state_file_path(self) -> str:
+        return cache_file_path(self.cluster.api.url, ".supervisor.json")
+
+    def save_state(self, file_path: str = None) -> str:
+        """
+        Writes the tasks health to disk, to resume supervision in the next run.
+
+        :param str file_path: Defaults to the cache directory for the cluster
+        :return: the path of the state file
+        :rtype: str
+        """
+        file_path = file_path or self.state_file_path()
+        makedirs(path.dirname(path.abspath(file_path)), exist_ok=True)
+        with open(f"{file_path}.tmp", "w") as state_fd:
+            json.dump(self.state(), state_fd)
+        replace(f"{file_path}.tmp", file_path)
+        return file_path
+
+    def load_state_file(self, file_path: str = None) -> None:
+        """Restores the tasks health saved by save_state, if the file exists"""
+        file_path = file_path or self.state_file_path()
+        if not path.exists(file_path):
+            return
+        with open(file_path) as state_fd:
+            self.load_state(json.load(state_fd))
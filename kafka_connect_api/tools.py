@@ -1,4 +1,61 @@
 #  SPDX-License-Identifier: MPL-2.0
 #  Copyright 2020-2022 John Mille <john@compose-x.io>
 
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from hashlib import sha1
+from os import environ, path
+
 KEYISSET = lambda x, y: isinstance(y, dict) and x in y.keys() and y[x]
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def run_concurrently(function, items, max_workers: int = None) -> list:
+    """
+    Runs function against each of the items using a pool of threads.
+    Exceptions are captured per item and do not stop the processing of the other items.
+    The context (i.e. the operation deadline) of the caller is propagated to the threads.
+
+    :param function: callable taking one item as argument
+    :param items: iterable of items to process
+    :param int max_workers: Maximum number of threads. Defaults to DEFAULT_MAX_WORKERS
+    :return: list of (item, result, error) tuples, in the same order as items
+    :rtype: list[tuple]
+    """
+    items = list(items)
+    if not items:
+        return []
+    outcomes: list = []
+    with ThreadPoolExecutor(
+        max_workers=max_workers or min(len(items), DEFAULT_MAX_WORKERS)
+    ) as executor:
+        futures = [
+            executor.submit(copy_context().run, function, item) for item in items
+        ]
+        for item, future in zip(items, futures):
+            try:
+                outcomes.append((item, future.result(), None))
+            except Exception as error:
+                outcomes.append((item, None, error))
+    return outcomes
+
+
+def cache_file_path(url: str, suffix: str) -> str:
+    """
+    Path of a file cached for the cluster URL. In /tmp when running in AWS Lambda,
+    otherwise in the user cache directory.
+
+    :param str url: the cluster URL
+    :param str suffix: the file name suffix, i.e. .json.gz
+    :rtype: str
+    """
+    if environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+        cache_dir = "/tmp"
+    else:
+        cache_dir = environ.get(
+            "XDG_CACHE_HOME", path.join(path.expanduser("~"), ".cache")
+        )
+    return path.join(
+        cache_dir, "kafka-connect-api", f"{sha1(url.encode()).hexdigest()[:16]}{suffix}"
+    )
@@ -0,0 +1,261 @@
+#  SPDX-License-Identifier: MPL-2.0
+#  Copyright 2020-2022 John Mille <john@compose-x.io>
+
+"""
+Fixtures with an in-memory fake of the Kafka Connect REST API, served over HTTP on localhost
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from kafka_connect_api.kafka_connect_api import Api, Cluster
+
+
+class FakeConnect:
+    """
+    State of the fake connect cluster. Connectors are stored as
+
+    {name: {"config": {}, "state": str, "worker_id": str, "type": str, "tasks": [{"state", "worker_id", "trace"}]}}
+    """
+
+    def __init__(self):
+        self.version = "3.7.0"
+        self.cluster_scope_loggers = True
+        self.connectors = {}
+        self.loggers = {
+            "root": {"level": "INFO"},
+            "org.apache.kafka": {"level": "WARN"},
+        }
+        self.requests = []
+        self.delay = 0.0
+        self.slow_responses = {}
+        self.restart_fails = set()
+        self.lock = threading.Lock()
+
+    def add_connector(
+        self,
+        name,
+        tasks=1,
+        state="RUNNING",
+        task_state="RUNNING",
+        worker_id="worker-1:8083",
+        connector_type="sink",
+        config=None,
+        trace=None,
+    ):
+        _config = {
+            "connector.class": f"org.example.{connector_type.title()}Connector",
+            "tasks.max": str(tasks),
+            "name": name,
+        }
+        _config.update(config or {})
+        self.connectors[name] = {
+            "config": _config,
+            "state": state,
+            "worker_id": worker_id,
+            "type": connector_type,
+            "tasks": [
+                {"state": task_state, "worker_id": worker_id, "trace": trace}
+                for _ in range(tasks)
+            ],
+        }
+
+    def info(self, name):
+        connector = self.connectors[name]
+        return {
+            "name": name,
+            "config": connector["config"],
+            "tasks": [
+                {"connector": name, "task": task_id}
+                for task_id in range(len(connector["tasks"]))
+            ],
+            "type": connector["type"],
+        }
+
+    def status(self, name):
+        connector = self.connectors[name]
+        tasks = []
+        for task_id, task in enumerate(connector["tasks"]):
+            _task = {
+                "id": task_id,
+                "state": task["state"],
+                "worker_id": task["worker_id"],
+            }
+            if task["trace"]:
+                _task["trace"] = task["trace"]
+            tasks.append(_task)
+        return {
+            "name": name,
+            "connector": {
+                "state": connector["state"],
+                "worker_id": connector["worker_id"],
+            },
+            "tasks": tasks,
+            "type": connector["type"],
+        }
+
+    def handle(self, method, path, query, body):
+        parts = [part for part in path.split("/") if part]
+        if not parts:
+            return 200, {
+                "version": self.version,
+                "commit": "abc",
+                "kafka_cluster_id": "kafka-1",
+            }
+        if parts[0] == "admin" and parts[1] == "loggers":
+            return self.handle_loggers(method, parts[2:], query, body)
+        if parts[0] != "connectors":
+            return 404, {"error_code": 404, "message": "Not found"}
+        if len(parts) == 1:
+            if method == "POST":
+                self.add_connector(body["name"], config=body["config"])
+                return 201, self.info(body["name"])
+            expand = query.get("expand", [])
+            if not expand:
+                return 200, list(self.connectors.keys())
+            payload = {}
+            for name in self.connectors:
+                payload[name] = {}
+                if "info" in expand:
+                    payload[name]["info"] = self.info(name)
+                if "status" in expand:
+                    payload[name]["status"] = self.status(name)
+            return 200, payload
+        name = parts[1]
+        if len(parts) == 3 and parts[2] == "config" and method == "PUT":
+            created = name not in self.connectors
+            if created:
+                self.add_connector(name, config=body)
+            else:
+                self.connectors[name]["config"] = dict(body, name=name)
+            return (201 if created else 200), self.info(name)
+        if name not in self.connectors:
+            return 404, {"error_code": 404, "message": f"Connector {name} not found"}
+        connector = self.connectors[name]
+        if len(parts) == 2:
+            if method == "DELETE":
+                del self.connectors[name]
+                return 204, None
+            return 200, self.info(name)
+        action = parts[2]
+        if action == "status":
+            return 200, self.status(name)
+        if action == "config":
+            return 200, connector["config"]
+        if action in ["pause", "resume"]:
+            if connector["state"] != "FAILED":
+                connector["state"] = "PAUSED" if action == "pause" else "RUNNING"
+            return 202, None
+        if action == "restart":
+            connector["state"] = "RUNNING"
+            return 204, None
+        if action == "tasks":
+            if len(parts) == 3:
+                return 200, [
+                    {"id": {"connector": name, "task": task_id}, "config": {}}
+                    for task_id in range(len(connector["tasks"]))
+                ]
+            task = connector["tasks"][int(parts[3])]
+            if parts[4] == "status":
+                return 200, self.status(name)["tasks"][int(parts[3])]
+            if parts[4] == "restart":
+                if (name, int(parts[3])) in self.restart_fails:
+                    task["state"] = "FAILED"
+                else:
+                    task["state"] = "RUNNING"
+                    task["trace"] = None
+                return 204, None
+        return 404, {"error_code": 404, "message": "Not found"}
+
+    def handle_loggers(self, method, parts, query, body):
+        if not parts:
+            return 200, self.loggers
+        name = parts[0]
+        if method == "PUT":
+            self.loggers[name] = {"level": body["level"]}
+            if query.get("scope") == ["cluster"] and self.cluster_scope_loggers:
+                return 204, None
+            return 200, [name]
+        if name not in self.loggers:
+            return 404, {"error_code": 404, "message": f"Logger {name} not found"}
+        return 200, self.loggers[name]
+
+
+def make_handler(fake: FakeConnect):
+    class Handler(BaseHTTPRequestHandler):
+        def _dispatch(self, method):
+            parsed = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            with fake.lock:
+                fake.requests.append((method, self.path))
+            if fake.delay:
+                threading.Event().wait(fake.delay)
+            with fake.lock:
+                code, payload = fake.handle(
+                    method, parsed.path, parse_qs(parsed.query), body
+                )
+            if parsed.path in fake.slow_responses:
+                threading.Event().wait(fake.slow_responses[parsed.path])
+            content = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_PUT(self):
+            self._dispatch("PUT")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def fake_connect():
+    fake = FakeConnect()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(fake))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fake.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield fake
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(fake_connect):
+    return Api(url=fake_connect.url)
+
+
+@pytest.fixture
+def cluster(api):
+    return Cluster(api)
+
+
+def count_requests(fake: FakeConnect, method: str = None, pattern: str = None) -> int:
+    return len(
+        [
+            req
+            for req in fake.requests
+            if (method is None or req[0] == method)
+            and (pattern is None or re.search(pattern, req[1]))
+        ]
+    )
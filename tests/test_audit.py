@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+"""Request budgets of the high-level operations, recorded with `Api.record`."""
+
+import pytest
+
+from kafka_connect_api.audit import RequestBudgetExceeded, route_template
+from kafka_connect_api.kafka_connect_api import Connector
+
+
+def test_route_template():
+    assert route_template("/") == "/"
+    assert route_template("/connectors?expand=status") == "/connectors?expand=status"
+    assert (
+        route_template("/connectors/sink-a/tasks/3/restart")
+        == "/connectors/{connector}/tasks/{task}/restart"
+    )
+    assert route_template("/admin/loggers/org.apache") == "/admin/loggers/{logger}"
+
+
+def test_request_budgets(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", tasks=3)
+    connector = Connector(cluster, "sink-a")
+    with cluster.api.record(max_requests=1):
+        repr(cluster)
+    with cluster.api.record(max_requests=2) as audit:
+        cluster.set_logger_log_level("root", "DEBUG")
+    assert audit.summary() == {
+        "GET /admin/loggers": 1,
+        "PUT /admin/loggers/{logger}": 1,
+    }
+    assert __file__ in audit.requests[0].caller
+    task = connector.tasks[0]
+    with cluster.api.record(max_requests=1):
+        task.is_running()
+    with cluster.api.record() as audit:
+        connector.cycle_connector()
+    assert audit.count("POST", "/connectors/{connector}/tasks/{task}/restart") == 3
+    audit.assert_max_requests(6)
+    with pytest.raises(RequestBudgetExceeded):
+        audit.assert_max_requests(5)
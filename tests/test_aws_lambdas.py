@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.aws_lambdas` handlers."""
+
+import json
+
+from conftest import count_requests
+
+from kafka_connect_api import aws_lambdas
+
+
+def test_get_connector_lists_once(fake_connect):
+    fake_connect.add_connector("sink-a")
+    connector = aws_lambdas.get_connector(
+        {
+            "cluster": {"hostname": "localhost", "url": fake_connect.url},
+            "connector": {"name": "sink-a"},
+        }
+    )
+    assert connector.name == "sink-a"
+    assert count_requests(fake_connect, "GET", r"^/connectors$") == 1
+
+
+def test_batch_health_from_connectors_list(fake_connect):
+    fake_connect.add_connector("sink-a", tasks=2)
+    fake_connect.add_connector("sink-b", task_state="FAILED")
+    result = aws_lambdas.check_connectors_health(
+        {
+            "cluster": {"hostname": "localhost", "url": fake_connect.url},
+            "connectors": [{"name": "sink-a"}, {"name": "sink-b"}, {"name": "nope"}],
+        },
+        None,
+    )
+    assert [item["status"] for item in result["results"]] == [
+        "success",
+        "success",
+        "failed",
+    ]
+    assert [item["result"] for item in result["results"][:2]] == [True, False]
+    assert result["batchItemFailures"] == [{"itemIdentifier": "nope"}]
+    assert count_requests(fake_connect, "GET", r"^/connectors$") == 1
+
+
+def test_batch_delete_from_sqs_records(fake_connect, monkeypatch):
+    monkeypatch.setenv("CONNECT_CLUSTER_URL", fake_connect.url)
+    fake_connect.add_connector("sink-a")
+    fake_connect.add_connector("sink-b")
+    event = {
+        "Records": [
+            {"messageId": "1", "body": json.dumps({"connector": {"name": "sink-a"}})},
+            {"messageId": "2", "body": json.dumps({"name": "sink-b"})},
+            {"messageId": "3", "body": "not-json"},
+        ]
+    }
+    result = aws_lambdas.delete_connectors(event, None)
+    assert result["batchItemFailures"] == [{"itemIdentifier": "3"}]
+    assert not fake_connect.connectors
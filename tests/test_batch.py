@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.batch`."""
+
+import pytest
+
+SINK_CONFIG = {"connector.class": "org.example.SinkConnector", "topics": "orders"}
+
+
+def test_batch_dependencies(api, fake_connect):
+    fake_connect.add_connector("sink-a")
+    fake_connect.add_connector("sink-c", state="PAUSED")
+    batch = api.batch()
+    deleted = batch.delete_connector("sink-a", name="delete-a")
+    batch.set_config("sink-b", SINK_CONFIG, depends_on=[deleted], name="create-b")
+    batch.resume("sink-c", name="resume-c")
+    failing = batch.pause("nope", name="pause-nope")
+    batch.resume("nope", depends_on=[failing], name="resume-nope")
+    with pytest.raises(KeyError):
+        batch.pause("sink-c", depends_on=["unknown"])
+
+    result = batch.execute()
+    statuses = {op["id"]: op["status"] for op in result["operations"]}
+    assert statuses == {
+        "delete-a": "succeeded",
+        "create-b": "succeeded",
+        "resume-c": "succeeded",
+        "pause-nope": "failed",
+        "resume-nope": "skipped",
+    }
+    assert not result["succeeded"]
+    assert sorted(fake_connect.connectors) == ["sink-b", "sink-c"]
+    assert fake_connect.connectors["sink-c"]["state"] == "RUNNING"
+
+
+def test_batch_rollback(api, fake_connect):
+    fake_connect.add_connector("sink-a", config={"topics": "before"})
+    batch = api.batch()
+    updated = batch.set_config("sink-a", dict(SINK_CONFIG, topics="after"))
+    created = batch.set_config("sink-b", SINK_CONFIG)
+    batch.pause("nope", depends_on=[updated, created])
+    result = batch.execute(rollback=True)
+    assert sorted(result["rolled_back"]) == ["op-0", "op-1"]
+    assert fake_connect.connectors["sink-a"]["config"]["topics"] == "before"
+    assert "sink-b" not in fake_connect.connectors
+
+
+def test_batch_default_ids_do_not_collide(api):
+    batch = api.batch()
+    assert batch.pause("sink-a", name="op-1") == "op-1"
+    assert batch.pause("sink-b") == "op-2"
+    assert batch.pause("sink-c", name="1") == "1"
+    assert batch.pause("sink-d") == "op-3"
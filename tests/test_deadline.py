@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.deadline` and requests timeouts."""
+
+import threading
+from time import monotonic, sleep
+
+import pytest
+from requests.exceptions import Timeout
+
+from kafka_connect_api import aws_lambdas
+from kafka_connect_api.deadline import LAMBDA_DEADLINE_MARGIN, Deadline
+from kafka_connect_api.errors import DeadlineExceeded
+from kafka_connect_api.kafka_connect_api import Api, Connector
+from kafka_connect_api.rolling_restart import RollingRestart
+from kafka_connect_api.tools import run_concurrently
+
+
+class LambdaContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def test_timeouts_and_deadline(cluster, fake_connect):
+    fake_connect.delay = 0.5
+    with pytest.raises(Timeout):
+        Api(url=fake_connect.url, read_timeout=0.1).get("/connectors")
+    with Deadline(0.1):
+        with pytest.raises(DeadlineExceeded):
+            cluster.api.get("/connectors")
+        with pytest.raises(DeadlineExceeded):
+            cluster.api.get("/connectors")
+        with Deadline(60) as inner:
+            assert inner.remaining() < 0.1
+        outcomes = run_concurrently(lambda _: cluster.api.get("/"), range(2))
+        assert all(isinstance(error, DeadlineExceeded) for _, _, error in outcomes)
+
+
+def test_cycle_connector_resumes_after_deadline(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", tasks=2)
+    fake_connect.delay = 0.1
+    with Deadline(0.25):
+        with pytest.raises((DeadlineExceeded, Timeout)):
+            Connector(cluster, "sink-a").cycle_connector()
+    assert fake_connect.connectors["sink-a"]["state"] == "RUNNING"
+
+
+def test_cycle_connector_resumes_after_late_pause(cluster, fake_connect):
+    fake_connect.add_connector("sink-a")
+    fake_connect.slow_responses["/connectors/sink-a/pause"] = 0.5
+    with Deadline(0.2):
+        with pytest.raises(DeadlineExceeded):
+            Connector(cluster, "sink-a").cycle_connector()
+    assert fake_connect.connectors["sink-a"]["state"] == "RUNNING"
+
+
+def test_batch_handler_partial_results(fake_connect, monkeypatch):
+    monkeypatch.setattr(aws_lambdas, "BATCH_MAX_WORKERS", 1)
+    for index in range(4):
+        fake_connect.add_connector(f"sink-{index}")
+    fake_connect.delay = 0.2
+    result = aws_lambdas.check_connectors_health(
+        {
+            "cluster": {"hostname": "localhost", "url": fake_connect.url},
+            "connectors": [{"name": f"sink-{index}"} for index in range(4)],
+        },
+        LambdaContext(LAMBDA_DEADLINE_MARGIN * 1000 + 500),
+    )
+    statuses = [item["status"] for item in result["results"]]
+    assert statuses[0] == "success"
+    assert statuses[-1] == "failed"
+    assert len(result["batchItemFailures"]) == statuses.count("failed")
+
+
+def test_coalesced_gets_do_not_share_deadlines(cluster, fake_connect):
+    fake_connect.delay = 0.5
+    outcomes: dict = {}
+
+    def _get(key, seconds):
+        try:
+            with Deadline(seconds):
+                outcomes[key] = cluster.api.get("/connectors")
+        except Exception as error:
+            outcomes[key] = error
+
+    leader = threading.Thread(target=_get, args=("leader", 0.1))
+    waiter = threading.Thread(target=_get, args=("waiter", None))
+    leader.start()
+    sleep(0.05)
+    waiter.start()
+    leader.join()
+    waiter.join()
+    assert isinstance(outcomes["leader"], DeadlineExceeded)
+    assert outcomes["waiter"] == []
+
+    leader = threading.Thread(target=_get, args=("leader", None))
+    leader.start()
+    sleep(0.05)
+    start = monotonic()
+    _get("waiter", 0.1)
+    assert monotonic() - start < 0.3
+    assert isinstance(outcomes["waiter"], DeadlineExceeded)
+    leader.join()
+    assert outcomes["leader"] == []
+
+
+def test_request_timeout_after_deadline(api):
+    with Deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            api.request_timeout()
+
+
+def test_restart_all_connectors_partial_results(fake_connect):
+    for index in range(3):
+        fake_connect.add_connector(f"sink-{index}")
+    fake_connect.delay = 0.3
+    result = aws_lambdas.restart_all_connectors(
+        {"cluster": {"hostname": "localhost", "url": fake_connect.url}},
+        LambdaContext(LAMBDA_DEADLINE_MARGIN * 1000 + 2500),
+    )
+    assert result["not_restarted"]
+
+
+def test_rolling_restart_deadline_is_not_a_failure(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", task_state="FAILED")
+    fake_connect.add_connector("sink-b")
+    fake_connect.restart_fails.add(("sink-a", 0))
+    with Deadline(1.0):
+        report = RollingRestart(
+            cluster, wave_timeout=60, poll_interval=0.1, max_failure_rate=0
+        ).run()
+    assert report["unverified"] == ["sink-a"]
+    assert report["failed"] == []
+    assert report["skipped"] == ["sink-b"]
+    assert report["reason"] == "deadline"
+
+
+def test_cluster_health_partial_results(fake_connect):
+    fake_connect.add_connector("sink-a")
+    fake_connect.delay = 0.3
+    result = aws_lambdas.check_cluster_health(
+        {"cluster": {"hostname": "localhost", "url": fake_connect.url}},
+        LambdaContext(LAMBDA_DEADLINE_MARGIN * 1000 + 100),
+    )
+    assert result == {"healthy": 0, "unhealthy": {}, "complete": False}
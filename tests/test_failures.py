@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.failures`."""
+
+from conftest import count_requests
+
+from kafka_connect_api.failures import exception_signature, parse_trace
+from kafka_connect_api.kafka_connect_api import Connector
+
+TIMEOUT_TRACE = """org.apache.kafka.connect.errors.ConnectException: Exiting WorkerSinkTask due to unrecoverable exception.
+\tat org.apache.kafka.connect.runtime.WorkerSinkTask.deliverMessages(WorkerSinkTask.java:{line})
+Caused by: org.apache.kafka.common.errors.TimeoutException: Timeout of {timeout}ms expired for topic '{topic}'
+\tat org.apache.kafka.clients.consumer.KafkaConsumer.poll(KafkaConsumer.java:1)
+"""
+AUTH_TRACE = (
+    "java.sql.SQLException: Access denied for user 'app'@'10.0.0.{}'\n\tat db.connect()"
+)
+
+
+def test_exception_signature():
+    first = exception_signature(
+        TIMEOUT_TRACE.format(line=618, timeout=60000, topic="a")
+    )
+    second = exception_signature(
+        TIMEOUT_TRACE.format(line=620, timeout=30000, topic="b")
+    )
+    assert first == second
+    assert first.startswith("org.apache.kafka.connect.errors.ConnectException:")
+    assert (
+        "<- org.apache.kafka.common.errors.TimeoutException: Timeout of <n>ms" in first
+    )
+    assert exception_signature("") == ""
+    s3 = exception_signature(
+        "com.amazonaws.services.s3.model.AmazonS3Exception: Status Code: 403\n\tat x()"
+    )
+    assert s3 == "com.amazonaws.services.s3.model.AmazonS3Exception: Status Code: <n>"
+    assert exception_signature("java.lang.NullPointerException") == (
+        "java.lang.NullPointerException"
+    )
+
+
+def test_failure_report(cluster, fake_connect):
+    for index in range(3):
+        fake_connect.add_connector(
+            f"sink-{index}",
+            tasks=2,
+            task_state="FAILED",
+            trace=TIMEOUT_TRACE.format(line=index, timeout=index * 1000, topic=index),
+        )
+    fake_connect.add_connector("jdbc", task_state="FAILED", trace=AUTH_TRACE.format(3))
+    fake_connect.add_connector("healthy")
+    report = cluster.failures()
+    assert count_requests(fake_connect, "GET") == 1
+    assert report.count == 7
+    assert [group.count for group in report.groups] == [6, 1]
+    assert report.groups[0].connectors == ["sink-0", "sink-1", "sink-2"]
+    assert report.groups[1].exception == "java.sql.SQLException"
+    assert Connector(cluster, "jdbc").failures == {0: AUTH_TRACE.format(3)}
+    assert report.groups[0].restart()["failed"] == {}
+    assert cluster.failures().count == 1
+    report.groups[1].pause()
+    assert fake_connect.connectors["jdbc"]["state"] == "PAUSED"
+
+
+def test_failure_group_exception_without_message(cluster, fake_connect):
+    trace = (
+        "java.lang.NullPointerException\n\tat x()\nCaused by: java.io.IOException: boom"
+    )
+    assert parse_trace(trace) == (
+        "java.lang.NullPointerException <- java.io.IOException: boom",
+        "java.lang.NullPointerException",
+    )
+    fake_connect.add_connector("sink-a", task_state="FAILED", trace=trace)
+    group = cluster.failures().groups[0]
+    assert group.exception == "java.lang.NullPointerException"
@@ -2,9 +2,15 @@
 
 """Tests for `kafka_connect_api` package."""
 
+from threading import Barrier, Thread
+from time import sleep
+
 import pytest
+from conftest import count_requests
 
 from kafka_connect_api import kafka_connect_api
+from kafka_connect_api.json_codec import available_json_codecs
+from kafka_connect_api.tools import run_concurrently
 
 
 @pytest.fixture
@@ -21,3 +27,44 @@ def test_content(response):
     """Sample pytest test function with the pytest fixture as an argument."""
     # from bs4 import BeautifulSoup
     # assert 'GitHub' in BeautifulSoup(response.content).title.string
+
+
+def test_concurrent_gets_are_coalesced(cluster, fake_connect):
+    fake_connect.add_connector("sink-a")
+    fake_connect.delay = 0.3
+    barrier = Barrier(8)
+
+    def _list(_):
+        barrier.wait()
+        return cluster.connectors
+
+    outcomes = run_concurrently(_list, range(8), max_workers=8)
+    assert all(list(result) == ["sink-a"] for _, result, _ in outcomes)
+    stats = cluster.api.coalescing_stats
+    assert stats["requests"] + stats["coalesced"] == 8
+    assert stats["coalesced"] > 0
+    assert count_requests(fake_connect, "GET", r"^/connectors$") == stats["requests"]
+
+
+def test_get_after_write_is_not_coalesced(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", config={"topics": "old"})
+    fake_connect.slow_responses["/connectors/sink-a"] = 0.5
+    connector = kafka_connect_api.Connector(cluster, "sink-a")
+    reader = Thread(target=lambda: connector.config)
+    reader.start()
+    sleep(0.1)
+    connector.config = {"topics": "new"}
+    assert connector.config["topics"] == "new"
+    reader.join()
+
+
+@pytest.mark.parametrize("codec", [codec.name for codec in available_json_codecs()])
+def test_json_codecs(fake_connect, codec):
+    api = kafka_connect_api.Api(url=fake_connect.url, json_codec=codec)
+    assert api.json_codec.name == codec
+    connector = kafka_connect_api.Connector(kafka_connect_api.Cluster(api), "sink-a")
+    connector.config = {"connector.class": "org.example.SinkConnector", "topics": "é"}
+    assert connector.config["topics"] == "é"
+    assert api.get("/connectors") == ["sink-a"]
+    with pytest.raises(ValueError):
+        kafka_connect_api.Api(url=fake_connect.url, json_codec="yaml")
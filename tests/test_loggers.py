@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""Tests for the cluster loggers management."""
+
+from time import sleep
+
+import pytest
+from conftest import count_requests
+
+
+def test_set_log_levels(cluster, fake_connect):
+    fake_connect.loggers["org.apache.kafka.connect"] = {"level": "INFO"}
+    with cluster.api.record(max_requests=3):
+        results = cluster.set_log_levels(
+            {"root": "DEBUG", "org.apache.kafka.connect": "TRACE"}
+        )
+    assert sorted(results["succeeded"]) == ["org.apache.kafka.connect", "root"]
+    assert fake_connect.loggers["root"]["level"] == "DEBUG"
+    cluster.set_logger_log_level("root", "INFO")
+    assert count_requests(fake_connect, "GET", r"^/admin/loggers$") == 1
+    with pytest.raises(ValueError):
+        cluster.set_log_levels({"root": "LOUD"})
+    with pytest.raises(ValueError):
+        cluster.set_log_levels({"nope": "INFO"})
+
+
+def test_set_log_levels_cluster_scope(cluster, fake_connect):
+    assert cluster.set_log_levels({"root": "WARN"}, scope="cluster")["scope"] == (
+        "cluster"
+    )
+    assert count_requests(fake_connect, "PUT", r"scope=cluster") == 1
+    assert cluster.supports_cluster_scope_loggers()
+    assert count_requests(fake_connect, "GET", r"^/$") == 0
+
+
+def test_set_log_levels_cluster_scope_not_supported(cluster, fake_connect):
+    fake_connect.version = "7.4.0-ccs"
+    fake_connect.cluster_scope_loggers = False
+    results = cluster.set_log_levels({"root": "WARN"}, scope="cluster")
+    assert results["scope"] == "worker"
+    assert cluster.supports_cluster_scope_loggers() is False
+    results = cluster.set_log_levels({"root": "ERROR"}, scope="cluster")
+    assert results["scope"] == "worker"
+    assert count_requests(fake_connect, "PUT", r"scope=cluster") == 1
+    assert cluster.root_logger == {"level": "ERROR"}
+
+
+def test_temporary_log_levels(cluster, fake_connect):
+    with cluster.temporary_log_levels({"root": "DEBUG"}) as override:
+        assert override.changed == {"root": {"from": "INFO", "to": "DEBUG"}}
+        assert fake_connect.loggers["root"]["level"] == "DEBUG"
+    assert fake_connect.loggers["root"]["level"] == "INFO"
+    override = cluster.temporary_log_levels({"org.apache.kafka": "DEBUG"}, duration=0.2)
+    assert fake_connect.loggers["org.apache.kafka"]["level"] == "DEBUG"
+    sleep(0.5)
+    assert fake_connect.loggers["org.apache.kafka"]["level"] == "WARN"
+    assert not override.changed
+
+
+def test_temporary_log_levels_applied_once(cluster, fake_connect, monkeypatch):
+    puts = []
+
+    def _failing_put(*args, **kwargs):
+        puts.append(args)
+        raise ConnectionError("worker unavailable")
+
+    monkeypatch.setattr(cluster.api, "put_raw", _failing_put)
+    with cluster.temporary_log_levels({"root": "DEBUG"}, duration=60) as override:
+        timer = override._timer
+        assert override.apply() is override
+        assert override._timer is timer
+        assert not override.changed
+    assert len(puts) == 1
+    assert timer.finished.is_set()
+    monkeypatch.undo()
+    with cluster.api.record() as audit:
+        with cluster.temporary_log_levels({"root": "DEBUG"}):
+            pass
+    assert len([req for req in audit.requests if req.method == "PUT"]) == 2
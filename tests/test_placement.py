@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.placement`."""
+
+import pytest
+from conftest import count_requests
+
+from kafka_connect_api.kafka_connect_api import Connector
+
+
+def test_placement_report(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", tasks=6, worker_id="w1")
+    fake_connect.add_connector("sink-b", tasks=2, worker_id="w1")
+    fake_connect.add_connector("sink-c", tasks=1, worker_id="w2")
+    fake_connect.add_connector("sink-d", tasks=1, worker_id="w3")
+    fake_connect.connectors["sink-b"]["worker_id"] = "w2"
+    report = cluster.placement(heavy_tasks=4)
+    assert count_requests(fake_connect, "GET") == 1
+    assert report.tasks_per_worker == {"w1": 8, "w2": 1, "w3": 1}
+    assert report.connectors_per_worker == {"w1": 1, "w2": 2, "w3": 1}
+    assert report.skew == pytest.approx(8 / (10 / 3))
+    assert report.heavy_connectors == {
+        "sink-a": {"tasks": 6, "top_worker": "w1", "concentration": 1.0}
+    }
+    assert report.suggest_restarts() == ["sink-a"]
+    assert Connector(cluster, "sink-b").tasks[1].worker_id == "w1"
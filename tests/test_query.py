@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.query`."""
+
+from conftest import count_requests
+
+
+def test_query_filters(cluster, fake_connect):
+    fake_connect.add_connector("s3-sink-a", config={"topics": "orders"})
+    fake_connect.add_connector("s3-sink-b", task_state="FAILED")
+    fake_connect.add_connector("jdbc-source", connector_type="source")
+
+    assert cluster.query().name("s3-*").names() == ["s3-sink-a", "s3-sink-b"]
+    assert count_requests(fake_connect, "GET", r"^/connectors$") == 1
+    assert cluster.query().name_regex(r"source$").names() == ["jdbc-source"]
+    assert cluster.query().type("source").names() == ["jdbc-source"]
+    assert cluster.query().connector_class("SinkConnector").count() == 2
+    assert cluster.query().config("topics", "orders").names() == ["s3-sink-a"]
+    assert cluster.query().config("topics", lambda value: "ord" in value).exists()
+    assert not cluster.query().state("PAUSED").exists()
+    assert cluster.query().task_state("FAILED").first().name == "s3-sink-b"
+    assert count_requests(fake_connect, "GET", r"expand=info") == 3
+    assert count_requests(fake_connect, "GET", r"^/connectors/") == 0
+
+
+def test_query_bulk_actions(cluster, fake_connect):
+    fake_connect.add_connector("s3-sink-a")
+    fake_connect.add_connector("s3-sink-b")
+    fake_connect.add_connector("jdbc-source", connector_type="source")
+    result = cluster.query().type("sink").pause()
+    assert sorted(result["succeeded"]) == ["s3-sink-a", "s3-sink-b"]
+    assert cluster.query().state("PAUSED").count() == 2
+    cluster.query().state("PAUSED").resume()
+    assert not cluster.query().state("PAUSED").exists()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.rolling_restart`."""
+
+from kafka_connect_api.rolling_restart import RollingRestart
+
+
+def test_plan_failed_first(cluster, fake_connect):
+    fake_connect.add_connector("sink-a")
+    fake_connect.add_connector("sink-b", task_state="FAILED")
+    fake_connect.add_connector("sink-c")
+    waves = RollingRestart(cluster, wave_size=2).plan()
+    assert waves == [["sink-b", "sink-a"], ["sink-c"]]
+    task_waves = RollingRestart(cluster, wave_size=3, tasks_only=True).plan()
+    assert task_waves == [[("sink-b", 0), ("sink-a", 0), ("sink-c", 0)]]
+
+
+def test_rolling_restart_recovers_failed(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", tasks=2, task_state="FAILED")
+    fake_connect.add_connector("sink-b")
+    report = RollingRestart(cluster, wave_timeout=1, poll_interval=0.1).run()
+    assert report["restarted"] == ["sink-a", "sink-b"]
+    assert not report["failed"] and not report["aborted"]
+    assert fake_connect.connectors["sink-a"]["tasks"][1]["state"] == "RUNNING"
+
+
+def test_rolling_restart_stops_on_failure_rate(cluster, fake_connect):
+    for name in ["sink-a", "sink-b", "sink-c"]:
+        fake_connect.add_connector(name, task_state="FAILED")
+        fake_connect.restart_fails.add((name, 0))
+    report = RollingRestart(
+        cluster, wave_timeout=0.2, poll_interval=0.1, max_failure_rate=0.4
+    ).run()
+    assert report["aborted"]
+    assert report["failed"] == ["sink-a"]
+    assert report["skipped"] == ["sink-b", "sink-c"]
+
+
+def test_rolling_restart_restarts_failed_connector(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", state="FAILED", task_state="FAILED")
+    fake_connect.add_connector("sink-b")
+    report = RollingRestart(cluster, wave_timeout=1, poll_interval=0.1).run()
+    assert report["restarted"] == ["sink-a", "sink-b"]
+    assert not report["aborted"]
+    assert fake_connect.connectors["sink-a"]["state"] == "RUNNING"
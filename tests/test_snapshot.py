@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.snapshot`."""
+
+from conftest import count_requests
+
+from kafka_connect_api.snapshot import ClusterSnapshot
+
+
+def test_snapshot_save_load_refresh(cluster, fake_connect, tmp_path):
+    fake_connect.add_connector("sink-a")
+    fake_connect.add_connector("sink-b")
+    file_path = str(tmp_path / "snapshot.json.gz")
+    first = ClusterSnapshot.load_or_take(cluster, file_path)
+    assert sorted(first.connectors) == ["sink-a", "sink-b"]
+    assert count_requests(fake_connect, "GET", r"expand=info") == 1
+
+    fake_connect.add_connector("sink-c")
+    del fake_connect.connectors["sink-b"]
+    fake_connect.connectors["sink-a"]["tasks"][0]["state"] = "FAILED"
+    second = ClusterSnapshot.load_or_take(cluster, file_path)
+    assert count_requests(fake_connect, "GET", r"expand=info") == 1
+    assert count_requests(fake_connect, "GET", r"^/connectors/sink-c$") == 1
+    assert count_requests(fake_connect, "GET", r"^/connectors/sink-a$") == 0
+
+    changes = ClusterSnapshot.load(file_path).diff(second)
+    assert changes == {
+        "added": [],
+        "removed": [],
+        "config_changed": [],
+        "status_changed": [],
+    }
+    assert first.diff(second) == {
+        "added": ["sink-c"],
+        "removed": ["sink-b"],
+        "config_changed": [],
+        "status_changed": ["sink-a"],
+    }
+    fake_connect.connectors["sink-a"]["config"]["topics"] = "changed"
+    assert second.refresh(cluster, full=True)["config_changed"] == ["sink-a"]
+
+
+def test_snapshot_full_refresh_after_max_age(cluster, fake_connect, tmp_path):
+    fake_connect.add_connector("sink-a")
+    file_path = str(tmp_path / "snapshot.json.gz")
+    first = ClusterSnapshot.load_or_take(cluster, file_path)
+    fake_connect.connectors["sink-a"]["config"]["topics"] = "changed"
+    second = ClusterSnapshot.load_or_take(cluster, file_path, max_age=3600)
+    assert first.diff(second)["config_changed"] == []
+    assert second.full_taken_at == first.full_taken_at
+    third = ClusterSnapshot.load_or_take(cluster, file_path, max_age=0)
+    assert first.diff(third)["config_changed"] == ["sink-a"]
+    assert third.full_taken_at > first.full_taken_at
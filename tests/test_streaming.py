@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.streaming`."""
+
+import json
+
+import pytest
+
+from kafka_connect_api import aws_lambdas
+from kafka_connect_api.streaming import iter_json_items
+
+PAYLOADS = [
+    {"sink-é": {"status": {"tasks": [1, 2.5, -3e2, None, True]}}, "b": 'x\\"}'},
+    ["a", 12345, {"k": [1, 2]}, [], {}, "ü\n"],
+    [1, 2.5, -3e2, 10, 0.125],
+    {"a": 2.5, "b": -3e-2},
+    {},
+    [],
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 7, 4096])
+def test_iter_json_items(payload, chunk_size):
+    content = json.dumps(payload, ensure_ascii=False, indent=1).encode()
+    chunks = [
+        content[index : index + chunk_size]
+        for index in range(0, len(content), chunk_size)
+    ]
+    items = list(iter_json_items(chunks))
+    if isinstance(payload, dict):
+        assert dict(items) == payload
+    else:
+        assert items == payload
+
+
+def test_iter_json_items_invalid():
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'{"a": 1', b", "]))
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'"a"']))
+
+
+def test_stream_cluster_health(cluster, fake_connect):
+    fake_connect.add_connector("sink-a")
+    fake_connect.add_connector("sink-b", tasks=2, task_state="FAILED")
+    assert [name for name, _ in cluster.iter_connectors()] == ["sink-a", "sink-b"]
+    result = aws_lambdas.check_cluster_health(
+        {"cluster": {"hostname": "localhost", "url": fake_connect.url}}, None
+    )
+    assert result == {
+        "healthy": 1,
+        "unhealthy": {"sink-b": ["RUNNING", "FAILED", "FAILED"]},
+        "complete": True,
+    }
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""Tests for `kafka_connect_api.supervisor`."""
+
+from kafka_connect_api.supervisor import Supervisor
+
+
+def event_types(events):
+    return [event["event"] for event in events]
+
+
+def test_supervisor_restarts_and_recovers(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", tasks=2)
+    fake_connect.connectors["sink-a"]["tasks"][1]["state"] = "FAILED"
+    supervisor = Supervisor(cluster)
+    assert event_types(supervisor.poll_once()) == ["task_failed", "task_restarted"]
+    events = supervisor.poll_once()
+    assert event_types(events) == ["task_recovered"]
+    assert events[0]["time_to_recovery"] >= 0
+    assert events[0]["connector"] == "sink-a" and events[0]["task"] == 1
+
+
+def test_supervisor_backoff_and_quarantine(cluster, fake_connect, tmp_path):
+    fake_connect.add_connector("sink-a", task_state="FAILED")
+    fake_connect.restart_fails.add(("sink-a", 0))
+    supervisor = Supervisor(cluster, base_backoff=0, max_restarts=2)
+    assert event_types(supervisor.poll_once()) == ["task_failed", "task_restarted"]
+    assert event_types(supervisor.poll_once()) == ["task_restarted"]
+    assert event_types(supervisor.poll_once()) == ["task_quarantined"]
+    assert supervisor.poll_once() == []
+    assert supervisor.quarantined == [("sink-a", 0)]
+
+    state_file = str(tmp_path / "state.json")
+    supervisor.save_state(state_file)
+    resumed = Supervisor(cluster, base_backoff=0, max_restarts=2)
+    resumed.load_state_file(state_file)
+    assert resumed.quarantined == [("sink-a", 0)]
+    resumed.release("sink-a", 0)
+    assert event_types(resumed.poll_once()) == ["task_restarted"]
+
+    backoff = Supervisor(cluster, base_backoff=60)
+    backoff.poll_once()
+    assert event_types(backoff.poll_once()) == []
+
+
+def test_supervisor_recovers_only_running_tasks(cluster, fake_connect):
+    fake_connect.add_connector("sink-a", task_state="FAILED")
+    fake_connect.add_connector("sink-b", task_state="FAILED")
+    supervisor = Supervisor(cluster, base_backoff=60)
+    supervisor.poll_once()
+    fake_connect.connectors["sink-a"]["tasks"][0]["state"] = "UNASSIGNED"
+    del fake_connect.connectors["sink-b"]
+    assert supervisor.poll_once() == []
+    assert list(supervisor.tasks) == [("sink-a", 0)]
+    fake_connect.connectors["sink-a"]["tasks"][0]["state"] = "RUNNING"
+    assert event_types(supervisor.poll_once()) == ["task_recovered"]